@@ -24,6 +24,7 @@
 import getopt, sys
 from pygel.RandomGraphs.DirectedPowerLawRandomGraph import *
 from pygel.RandomGraphs.UndirectedPowerLawRandomGraph import *
+from pygel.RandomGraphs.PreferentialAttachmentRandomGraph import *
 
 def usage(paramDefaults):
     helpString = """
@@ -39,6 +40,23 @@ DESCRIPTION
        -t, --threads=NUMBER
                Number of threads to use for the generation. Default: %s
 
+       -p, --processes=NUMBER
+               Number of processes to use for the generation instead of threads. Scales with the number of cores. Default: %s
+
+       -r, --seed=NUMBER
+               Seed of the random number generators. Runs with the same seed and number of threads/processes produce the same graph. Default: random
+
+       -K, --permutation-key=NUMBER
+               Scramble the vertex numbers with a keyed permutation, so that the hubs do not get the lowest numbers.
+               Default: not scrambled
+
+       -i, --shard-index=NUMBER
+               Only generate shard NUMBER (counted from 0) of the graph. Should be used with --shard-count and --seed.
+               Merge the shards with ./mergeshards.py
+
+       -n, --shard-count=NUMBER
+               Number of shards the graph is split into. The shards together hold the edges of a --threads=NUMBER run with the same seed. Default: %s
+
        -o, --output=FILENAME
                File for storing output. Default: %s
 
@@ -51,8 +69,10 @@ DESCRIPTION
        -e, --max-edges=NUMBER
                Maximum number of edges. Default: %s
 
-       -u, --type=[[directed][undirected]]
+       -u, --type=[[directed][undirected][preferential]]
                Type of the generated graph. Default: %s
+               'preferential' generates a Barabasi-Albert graph where every vertex adds --max-edges/--max-vertices edges.
+               It is generated by a single thread and cannot be used with --stream, --shard-count or --permutation-key.
 
        -m, --find-conncomps
                Toggle connected components computation. 
@@ -66,16 +86,27 @@ DESCRIPTION
        -s, --no-self-loops
                Disallow self-loops (vertex pointing to itself). 
 
+       -x, --exact-edges
+               Generate exactly --max-edges edges without duplicates and self-loops. Only for --type=undirected.
+               Cannot be used with --stream or --shard-count.
+
+       -S, --stream
+               Write edges to the output file while they are generated instead of keeping the whole graph in memory. Cannot be used with --find-conncomps.
+
+       -P, --progress
+               Report the edges generated, edges per second and estimated time left of every thread/process on standard error every second.
+               Only for --type=directed and --type=undirected. Cannot be used with --shard-count.
+
        -h, --help
                Show this page
-        """ % (paramDefaults['threads'], paramDefaults['output'], paramDefaults['format'], paramDefaults['max-vertices'], paramDefaults['max-edges'], paramDefaults['type'], paramDefaults['file-conncomps'], paramDefaults['only-largest'])
+        """ % (paramDefaults['threads'], paramDefaults['processes'], paramDefaults['shard-count'], paramDefaults['output'], paramDefaults['format'], paramDefaults['max-vertices'], paramDefaults['max-edges'], paramDefaults['type'], paramDefaults['file-conncomps'], paramDefaults['only-largest'])
 
     print helpString
     return
 
 
 if __name__=="__main__":
-    paramDefaults = { 'threads' : '1' , 'output' : '/tmp/graph.pyg', 'format': 'simple', 'max-vertices':'100', 'max-edges':'100', 'type':'directed', 'find-conncomps':0 ,'file-conncomps':'/tmp/graph.cc', 'only-largest':0, 'no-self-loops':0}
+    paramDefaults = { 'threads' : '1' , 'processes' : '0', 'seed' : None, 'permutation-key' : None, 'shard-index' : '0', 'shard-count' : '0', 'output' : '/tmp/graph.pyg', 'format': 'simple', 'max-vertices':'100', 'max-edges':'100', 'type':'directed', 'find-conncomps':0 ,'file-conncomps':'/tmp/graph.cc', 'only-largest':0, 'no-self-loops':0, 'stream':0, 'exact-edges':0, 'progress':0}
 
     
     if len(sys.argv) == 1:
@@ -83,7 +114,7 @@ if __name__=="__main__":
         sys.exit(0)
         
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "t:o:f:v:e:u:mc:lsh", ["threads=","output=","format=", "max-vertices=","max-edges=", "type=", "find-conncomps", "file-conncomps=", "only-largest","no-self-loops","help"])
+        opts, args = getopt.getopt(sys.argv[1:], "t:p:r:K:i:n:o:f:v:e:u:mc:lsSxPh", ["threads=","processes=","seed=","permutation-key=","shard-index=","shard-count=","output=","format=", "max-vertices=","max-edges=", "type=", "find-conncomps", "file-conncomps=", "only-largest","no-self-loops","stream","exact-edges","progress","help"])
     except getopt.GetoptError:
         usage(paramDefaults)
         sys.exit(2)
@@ -98,6 +129,26 @@ if __name__=="__main__":
         if o in options:
            config[options[1][2:]] = a
 
+        options = ("-p","--processes")
+        if o in options:
+           config[options[1][2:]] = a
+
+        options = ("-r","--seed")
+        if o in options:
+           config[options[1][2:]] = a
+
+        options = ("-K","--permutation-key")
+        if o in options:
+           config[options[1][2:]] = a
+
+        options = ("-i","--shard-index")
+        if o in options:
+           config[options[1][2:]] = a
+
+        options = ("-n","--shard-count")
+        if o in options:
+           config[options[1][2:]] = a
+
         options = ("-o","--output")
         if o in options:
            config[options[1][2:]] = a
@@ -134,27 +185,113 @@ if __name__=="__main__":
         if o in options:
            config[options[1][2:]] = 1
            
+        options = ("-S","--stream")
+        if o in options:
+           config[options[1][2:]] = 1
+
+        options = ("-x","--exact-edges")
+        if o in options:
+           config[options[1][2:]] = 1
+
+        options = ("-P","--progress")
+        if o in options:
+           config[options[1][2:]] = 1
+
         options = ("-h","--help")
         if o in options:
             usage(paramDefaults)
             sys.exit(0)
 
 
+    if str(config['format']) not in EdgeWriter.formats:
+        print "--format must be one of 'simple', 'dot' or 'csv'"
+        sys.exit(2)
+
+    if int(config['stream']) == 1 and config['find-conncomps'] == 1:
+        print "--stream cannot be used with --find-conncomps"
+        sys.exit(2)
+
+    shardIndex = int(config['shard-index'])
+    shardCount = int(config['shard-count'])
+    if shardCount > 0 and (config['seed'] is None or shardIndex < 0 or shardIndex >= shardCount):
+        print "--shard-count needs a --seed and a --shard-index between 0 and %s" % (shardCount-1)
+        sys.exit(2)
+    if shardCount > 0 and int(config['processes']) > 0:
+        print "--shard-count cannot be used with --processes"
+        sys.exit(2)
+
     type = str(config['type'])
 
+    exactEdges = int(config['exact-edges'])
+    if exactEdges == 1 and (type != 'undirected' or int(config['stream']) == 1 or shardCount > 0):
+        print "--exact-edges needs --type=undirected and cannot be used with --stream or --shard-count"
+        sys.exit(2)
+
+    if type == 'preferential' and (int(config['stream']) == 1 or shardCount > 0 or config['permutation-key'] is not None):
+        print "--type=preferential cannot be used with --stream, --shard-count or --permutation-key"
+        sys.exit(2)
+    if int(config['progress']) == 1 and (shardCount > 0 or type == 'preferential'):
+        print "--progress cannot be used with --shard-count or --type=preferential"
+        sys.exit(2)
+    if type == 'preferential' and int(config['max-vertices']) < 1:
+        print "--type=preferential needs --max-vertices of at least 1"
+        sys.exit(2)
+
+    seed = config['seed']
+    if seed is not None:
+        seed = int(seed)
+        print "Using seed %s..." % (seed)
+
+    permutationKey = config['permutation-key']
+    if permutationKey is not None:
+        permutationKey = int(permutationKey)
+        print "Scrambling vertex numbers with key %s..." % (permutationKey)
+
     graph = None
     if type == 'directed':
-        graph = DirectedPowerLawRandomGraph(int(config['max-vertices']),int(config['max-edges']))
+        graph = DirectedPowerLawRandomGraph(int(config['max-vertices']),int(config['max-edges']),seed,permutationKey)
     if type == 'undirected':
-        graph = UndirectedPowerLawRandomGraph(int(config['max-vertices']),int(config['max-edges']))
+        graph = UndirectedPowerLawRandomGraph(int(config['max-vertices']),int(config['max-edges']),seed,permutationKey)
+    if int(config['progress']) == 1 and graph is not None:
+        graph.progress = GenerationProgress()
+    if type == 'preferential':
+        graph = PreferentialAttachmentRandomGraph(int(config['max-vertices']),max(1,int(config['max-edges'])/int(config['max-vertices'])),seed)
+
+    if shardCount > 0:
+        print "Generating shard %s of %s..." % (shardIndex, shardCount)
+    elif type == 'preferential':
+        # Generated by the calling thread, no workers are spawned
+        noOfWorkers = 1
+    elif int(config['processes']) > 0:
+        workerType = 'process'
+        noOfWorkers = int(config['processes'])
+        print "Spawning %s process(es)..." % (config['processes'])
+    else:
+        workerType = 'thread'
+        noOfWorkers = int(config['threads'])
+        print "Spawning %s thread(s)..." % (config['threads'])
 
-    print "Spawning %s thread(s)..." % (config['threads'])
     noSelfLoops = int(config['no-self-loops'])
     if noSelfLoops == 1: 
         print "Self-loops are not allowed..."
     else:
         print "Self-loops are allowed..."
-    graph.generate(int(config['threads']),noSelfLoops)
+    if int(config['stream']) == 1:
+        if shardCount > 0:
+            noOfEdges = graph.generateShardToFile(shardIndex,shardCount,noSelfLoops,str(config['output']),str(config['format']))
+        else:
+            noOfEdges = graph.generateToFile(noOfWorkers,noSelfLoops,str(config['output']),str(config['format']),workerType)
+        print "%s edges streamed to file %s" % (noOfEdges, str(config['output']))
+        sys.exit(0)
+
+    if shardCount > 0:
+        graph.serialEdgeList = graph.generateShard(shardIndex,shardCount,noSelfLoops)
+    elif exactEdges == 1:
+        graph.generateUnique(noOfWorkers,workerType)
+    elif type == 'preferential':
+        graph.generate(noOfWorkers,noSelfLoops)
+    else:
+        graph.generate(noOfWorkers,noSelfLoops,workerType)
     graph.populate()
     graph.writeEdges(str(config['output']),str(config['format']))
     print "Output written to file %s" % (str(config['output']))
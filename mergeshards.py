@@ -0,0 +1,114 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+import getopt, sys
+from pygel.RandomGraphs.EdgeMerger import *
+
+def usage(paramDefaults):
+    helpString = """
+USAGE: ./mergeshards.py [options] SHARD_FILE...
+
+        Command line tool for merging the shards written by ./genwebgraph.py --shard-index=I --shard-count=N
+        into one graph. Concatenating the shards 0 to N-1 in order gives the same edges as a single
+        ./genwebgraph.py --threads=N run with the same seed.
+
+DESCRIPTION
+
+       -o, --output=FILENAME
+               File for storing the merged output. Default: %s
+
+       -f, --format=FMT
+               Format of the shards and of the output. Default: %s. Possible: 'simple' or 'dot' or 'csv'
+
+       -u, --type=[[directed][undirected]]
+               Type of the graph in the shards. Default: %s
+
+       -k, --sorted
+               K-way merge shards that are each sorted numerically by start and then end vertex number
+               into one sorted output instead of concatenating them. Sort the shards with
+               'sort -k1,1n -k3,3n' for the 'simple' and 'dot' formats, whose second field is the
+               arrow, and with 'sort -t, -k1,1n -k2,2n' for 'csv'. Unsorted shards are rejected.
+
+       -h, --help
+               Show this page
+        """ % (paramDefaults['output'], paramDefaults['format'], paramDefaults['type'])
+
+    print helpString
+    return
+
+
+if __name__=="__main__":
+    paramDefaults = { 'output' : '/tmp/graph.pyg', 'format': 'simple', 'type':'directed', 'sorted':0}
+
+    if len(sys.argv) == 1:
+        usage(paramDefaults)
+        sys.exit(0)
+
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "o:f:u:kh", ["output=","format=", "type=", "sorted", "help"])
+    except getopt.GetoptError:
+        usage(paramDefaults)
+        sys.exit(2)
+
+    config = {}
+
+    for param in paramDefaults:
+        config[param] = paramDefaults[param]
+
+    for o, a in opts:
+        options = ("-o","--output")
+        if o in options:
+           config[options[1][2:]] = a
+
+        options = ("-f","--format")
+        if o in options:
+           config[options[1][2:]] = a
+
+        options = ("-u","--type")
+        if o in options:
+           config[options[1][2:]] = a
+
+        options = ("-k","--sorted")
+        if o in options:
+           config[options[1][2:]] = 1
+
+        options = ("-h","--help")
+        if o in options:
+            usage(paramDefaults)
+            sys.exit(0)
+
+    if len(args) == 0:
+        usage(paramDefaults)
+        sys.exit(2)
+
+    if str(config['format']) not in EdgeWriter.formats:
+        print "--format must be one of 'simple', 'dot' or 'csv'"
+        sys.exit(2)
+
+    merger = EdgeMerger(str(config['format']), str(config['type']) == 'directed')
+    try:
+        noOfEdges = merger.merge(args, str(config['output']), config['sorted'])
+    except EdgeError, error:
+        print error.message
+        sys.exit(1)
+    print "%s edges from %s shard(s) written to file %s" % (noOfEdges, len(args), str(config['output']))
@@ -34,6 +34,9 @@ class AbstractEdge:
 
     __metaclass__ = MetaClass
 
+    ## Edges get no instance dictionary from this class
+    __slots__ = ()
+
     ## Abstract method for obtaining the start vertex of an edge. 
     getStartVertex = AbstractMethod('getStartVertex')
 
@@ -32,6 +32,9 @@ class AbstractVertex:
     """
     __metaclass__ = MetaClass
 
+    ## Empty, so that subclasses declaring slots get no instance dictionary
+    __slots__ = ()
+
     ## Abstract method for obtaining the vertex number
     getVertexNumber = AbstractMethod('getVertexNumber')
 
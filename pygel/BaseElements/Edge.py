@@ -29,7 +29,10 @@ class Edge(AbstractEdge):
 
         \ingroup BaseElements
     """
-    
+
+    ## Attributes of an edge
+    __slots__ = ('startVertex', 'endVertex')
+
     def __init__(self):
         """ Constructs an emtpy edge
         """
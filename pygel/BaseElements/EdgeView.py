@@ -0,0 +1,97 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+from AbstractEdge import *
+
+class EdgeView(AbstractEdge):
+    """ Edge of a Graph::EdgeStore, made on demand. It holds no vertices itself but reads and writes the columns of
+        the store, so it behaves like a BaseElements::Edge of the graph without the graph keeping an object per edge
+
+        \ingroup BaseElements
+    """
+
+    ## Store and number of the edge
+    __slots__ = ('edgeStore', 'edgeNumber')
+
+    def __init__(self, edgeStore, edgeNumber):
+        """ Constructs a view of an edge
+
+            @param edgeStore Graph::EdgeStore holding the edge
+            @param edgeNumber Edge number of the edge
+        """
+        ## Graph::EdgeStore holding the edge
+        self.edgeStore = edgeStore
+
+        ## Edge number of the edge
+        self.edgeNumber = edgeNumber
+
+    def getStartVertex(self):
+        """ Get the start vertex
+
+            @return startVertex Start vertex of type BaseElements::Vertex
+        """
+        return self.edgeStore.getVertex(self.edgeStore.startVertices[self.edgeNumber])
+
+    def getEndVertex(self):
+        """ Get the end vertex
+
+            @return endVertex End vertex of type BaseElements::Vertex
+        """
+        return self.edgeStore.getVertex(self.edgeStore.endVertices[self.edgeNumber])
+
+    def setStartVertex(self, vertex):
+        """ Set the start vertex. Like BaseElements::Edge::setStartVertex it does not update the indices of the graph
+
+            @param vertex Start vertex of type BaseElements::Vertex
+        """
+        self.edgeStore.startVertices[self.edgeNumber] = vertex.vertexNumber
+
+    def setEndVertex(self, vertex):
+        """ Set the end vertex. Like BaseElements::Edge::setEndVertex it does not update the indices of the graph
+
+            @param vertex End vertex of type BaseElements::Vertex
+        """
+        self.edgeStore.endVertices[self.edgeNumber] = vertex.vertexNumber
+
+    ## Start vertex, as for BaseElements::Edge
+    startVertex = property(getStartVertex, setStartVertex)
+
+    ## End vertex, as for BaseElements::Edge
+    endVertex = property(getEndVertex, setEndVertex)
+
+    def __eq__(self, other):
+        """ Views are equal if they show the same edge of the same store
+        """
+        return isinstance(other, EdgeView) and self.edgeStore is other.edgeStore and \
+               self.edgeNumber == other.edgeNumber
+
+    def __ne__(self, other):
+        """ Negation of EdgeView::__eq__
+        """
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        """ Hash consistent with EdgeView::__eq__
+        """
+        return hash((id(self.edgeStore), self.edgeNumber))
@@ -30,6 +30,10 @@ class Vertex(AbstractVertex):
         \ingroup BaseElements
 
     """
+
+    ## Attributes of a vertex. Without an instance dictionary a vertex takes a fraction of the memory
+    __slots__ = ('vertexNumber',)
+
     def __init__(self,vertexNumber):
         """ Constructs graph vertex given a vertex number
 
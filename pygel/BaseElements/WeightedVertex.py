@@ -21,12 +21,17 @@
 #
 #
 
+from Vertex import *
 
 class WeightedVertex(Vertex):
     """ Represents a weighted vertex
 
         \ingroup BaseElements
     """
+
+    ## Attributes added to those of BaseElements::Vertex
+    __slots__ = ('vertexWeight',)
+
     def __init__(self,vertexNumber,vertexWeight):
         """ Constructs a weighted vertex given a vertex number and vertex weight
 
@@ -27,4 +27,4 @@
     \defgroup BaseElements Basic Elements
 """
 
-__all__ = ['Edge','Vertex', 'WeightedVertex','WeightedVertices']
+__all__ = ['Edge','EdgeView','Vertex', 'WeightedVertex','WeightedVertices']
@@ -111,6 +111,42 @@ class DistError(Error):
         ## %Error message
         self.message = "DistError: Message = %s" % (message)
 
+class GenerationError(Error):
+    """ Represents a GenerationError exception. It handles failures of the workers generating a random graph
+
+        \ingroup Exceptions
+    """
+ 
+    def __init__(self, workerId, message):
+        """ Contructs a GenerationError exception
+
+            @param workerId Id of the worker that failed
+            @param message %Error message
+        """
+        ## Id of the worker that failed
+        self.workerId = workerId
+
+        ## %Error message
+        self.message = "GenerationError: Worker id = %s, Message = %s" % (workerId, message)
+
+class FormatError(Error):
+    """ Represents a FormatError exception. It handles unknown formats of edge files
+
+        \ingroup Exceptions
+    """
+ 
+    def __init__(self, format, message):
+        """ Contructs a FormatError exception
+
+            @param format Format that is not known
+            @param message %Error message
+        """
+        ## Format that is not known
+        self.format = format
+
+        ## %Error message
+        self.message = "FormatError: Format = %s, Message = %s" % (format, message)
+
 class ErrorMessages:
     """ Collection of various error message strings
 
@@ -122,3 +158,22 @@ class ErrorMessages:
     edgeNotFound = 'Edge number not found'
     distAddOne = 'Probabilities do not add to one'
     noSelfLoops = 'No self loops are allowed for this graph'
+    workerFailed = 'Worker exited with an error'
+    initiatorNotSquare = 'Initiator matrix is not square'
+    initiatorNotTwoByTwo = 'Initiator matrix is not 2x2'
+    noiseOutOfRange = 'Noise must be at least 0 and less than 1'
+    tooManyUniqueEdges = 'More unique edges requested than the graph can hold'
+    edgesOrProb = 'Exactly one of the number of edges and the edge probability must be given'
+    probOutOfRange = 'Probability must be between 0 and 1'
+    degreeSequencesDiffer = 'Degree sequences have different numbers of vertices'
+    blockProbsShape = 'Block probability matrix does not match the number of blocks'
+    ringNeighbors = 'Number of ring neighbors must be even and less than the number of vertices'
+    oddDegreeSum = 'Degrees must add to an even number'
+    degreesNotIntegers = 'Degrees must be integers'
+    radiusOutOfRange = 'Radius must be greater than 0'
+    chunkNotGenerated = 'Chunk was not generated'
+    batchSizeOutOfRange = 'Batch size must be greater than 0'
+    rateOutOfRange = 'Rate must be greater than 0'
+    timeStepOutOfRange = 'Time step must be greater than 0'
+    edgesNotSorted = 'Edges are not sorted by start and end vertex number'
+    unknownFormat = "Format is not one of 'simple', 'dot' or 'csv'"
@@ -0,0 +1,445 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+from pygel.Exceptions.Exceptions import *
+
+
+class CSRGraph:
+
+    """ Immutable directed graph in compressed sparse row (CSR) form. The vertices are numbered from 0 to n-1 in the
+        order of their vertex numbers, and the out-neighbors of vertex i are outTargets[outOffsets[i]:outOffsets[i+1]],
+        likewise the in-neighbors with inOffsets and inSources. No vertex or edge objects are kept, so an edge takes a
+        few integers instead of the objects and dictionary entries of Graph::NumberedEdgeDirectedGraph. Usually made
+        with Graph::NumberedEdgeDirectedGraph::freeze
+
+        \ingroup Graph
+    """
+
+    def __init__(self, vertexNumbers, outOffsets, outTargets, inOffsets, inSources, edgeNumbers):
+        """ Constructs a graph from its arrays. @see CSRGraph::fromEdges
+
+            @param vertexNumbers Sorted numpy array with the vertex number of every vertex
+            @param outOffsets Numpy array with the position of the first out-neighbor of every vertex in outTargets, and
+                              the number of edges at the end
+            @param outTargets Numpy array with the out-neighbors of all vertices, as positions in vertexNumbers
+            @param inOffsets Numpy array with the position of the first in-neighbor of every vertex in inSources, and
+                             the number of edges at the end
+            @param inSources Numpy array with the in-neighbors of all vertices, as positions in vertexNumbers
+            @param edgeNumbers Numpy array with the edge number of every edge in outTargets
+        """
+        ## Sorted numpy array with the vertex number of every vertex
+        self.vertexNumbers = vertexNumbers
+
+        ## Numpy array with the position of the first out-neighbor of every vertex in outTargets
+        self.outOffsets = outOffsets
+
+        ## Numpy array with the out-neighbors of all vertices, as positions in vertexNumbers
+        self.outTargets = outTargets
+
+        ## Numpy array with the position of the first in-neighbor of every vertex in inSources
+        self.inOffsets = inOffsets
+
+        ## Numpy array with the in-neighbors of all vertices, as positions in vertexNumbers
+        self.inSources = inSources
+
+        ## Numpy array with the edge number of every edge in outTargets
+        self.edgeNumbers = edgeNumbers
+
+    def fromEdges(startVertices, endVertices, vertexNumbers=None, edgeNumbers=None):
+        """ Builds a graph from its edges
+
+            @param startVertices Numpy array with the start vertex number of every edge
+            @param endVertices Numpy array with the end vertex number of every edge
+            @param vertexNumbers Vertex numbers of the graph, needed for vertices without edges. If None, only the
+                                 vertices of the edges are in the graph
+            @param edgeNumbers Numpy array with the edge number of every edge. If None, the edges are numbered from 0
+            @return Graph::CSRGraph
+        """
+        startVertices = numpy.asarray(startVertices, dtype=numpy.int64)
+        endVertices = numpy.asarray(endVertices, dtype=numpy.int64)
+        if edgeNumbers is None:
+            edgeNumbers = numpy.arange(len(startVertices))
+
+        allVertices = numpy.unique(numpy.concatenate([startVertices, endVertices]))
+        if vertexNumbers is not None:
+            allVertices = numpy.union1d(allVertices, numpy.asarray(vertexNumbers, dtype=numpy.int64))
+
+        noOfVertices = len(allVertices)
+        indexType = numpy.int64
+        if max(noOfVertices, len(startVertices)) < 2**31:
+            indexType = numpy.int32
+
+        startIndices = numpy.searchsorted(allVertices, startVertices).astype(indexType)
+        endIndices = numpy.searchsorted(allVertices, endVertices).astype(indexType)
+
+        # Stable sorts keep the edges of a vertex in the order of their edge numbers
+        outOrder = numpy.argsort(startIndices, kind='mergesort')
+        inOrder = numpy.argsort(endIndices, kind='mergesort')
+
+        return CSRGraph(allVertices,
+                        CSRGraph.getOffsets(startIndices, noOfVertices, indexType), endIndices[outOrder],
+                        CSRGraph.getOffsets(endIndices, noOfVertices, indexType), startIndices[inOrder],
+                        numpy.asarray(edgeNumbers)[outOrder])
+
+    fromEdges = staticmethod(fromEdges)
+
+    def fromEdgeIndex(edgeIndex, vertexNumbers):
+        """ Builds a graph from the edge index of a Graph::NumberedEdgeDirectedGraph. The edges are taken from its
+            columns without making edge views
+
+            @param edgeIndex Edge index of type Graph::EdgeStore
+            @param vertexNumbers Vertex numbers of the graph, including the vertices without edges
+            @return Graph::CSRGraph
+        """
+        edgeNumbers, startVertices, endVertices = edgeIndex.getColumns()
+        return CSRGraph.fromEdges(startVertices, endVertices, numpy.fromiter(vertexNumbers, dtype=numpy.int64),
+                                  edgeNumbers)
+
+    fromEdgeIndex = staticmethod(fromEdgeIndex)
+
+    def getOffsets(indices, noOfVertices, indexType):
+        """ Offsets of the rows of a CSR array
+
+            @param indices Numpy array with the row of every edge
+            @param noOfVertices Number of rows
+            @param indexType Numpy type of the offsets
+            @return Numpy array with noOfVertices+1 offsets
+        """
+        offsets = numpy.zeros(noOfVertices + 1, dtype=indexType)
+        numpy.cumsum(numpy.bincount(indices, minlength=noOfVertices), out=offsets[1:])
+        return offsets
+
+    getOffsets = staticmethod(getOffsets)
+
+    def getIndex(self, vertexNumber):
+        """ Position of a vertex in CSRGraph::vertexNumbers
+
+            @param vertexNumber Vertex number to look for
+            @return Position of the vertex
+            @throws PackageExceptions::VertexError
+        """
+        index = numpy.searchsorted(self.vertexNumbers, vertexNumber)
+        if index == len(self.vertexNumbers) or self.vertexNumbers[index] != vertexNumber:
+            raise VertexError(vertexNumber, ErrorMessages.vertexNotFound)
+        return index
+
+    def getIndices(self, vertexNumbers):
+        """ Positions of several vertices in CSRGraph::vertexNumbers
+
+            @param vertexNumbers Vertex numbers to look for
+            @return Numpy array with the position of every vertex
+            @throws PackageExceptions::VertexError
+        """
+        vertexNumbers = numpy.asarray(vertexNumbers, dtype=numpy.int64)
+        indices = numpy.searchsorted(self.vertexNumbers, vertexNumbers)
+
+        # searchsorted gives the position a missing vertex would be inserted at, so the vertex found there is checked
+        found = indices < len(self.vertexNumbers)
+        found[found] = self.vertexNumbers[indices[found]] == vertexNumbers[found]
+        if not found.all():
+            raise VertexError(int(vertexNumbers[~found][0]), ErrorMessages.vertexNotFound)
+        return indices
+
+    def getNumberOfVertices(self):
+        """ Get number of vertices
+
+            @return Number of vertices
+        """
+        return len(self.vertexNumbers)
+
+    def getNumberOfEdges(self):
+        """ Get number of edges
+
+            @return Number of edges
+        """
+        return len(self.outTargets)
+
+    def getVertexNumbers(self):
+        """ Get all vertex numbers
+
+            @return Sorted numpy array of vertex numbers
+        """
+        return self.vertexNumbers
+
+    def hasVertex(self, vertexNumber):
+        """ Checks if vertex is present
+
+            @param vertexNumber Vertex number of the vertex to check
+            @return 0 if found. 1 if not found
+        """
+        try:
+            self.getIndex(vertexNumber)
+            return 0
+        except VertexError, e:
+            return 1
+
+    def getOutNeighbors(self, vertexNumber):
+        """ Get out-neighbors for a vertex
+
+            @param vertexNumber Vertex number for which out-neighbors have to be obtained
+            @return Numpy array of vertex numbers, once per edge
+            @throws PackageExceptions::VertexError
+        """
+        index = self.getIndex(vertexNumber)
+        return self.vertexNumbers[self.outTargets[self.outOffsets[index]:self.outOffsets[index+1]]]
+
+    def getInNeighbors(self, vertexNumber):
+        """ Get in-neighbors for a vertex
+
+            @param vertexNumber Vertex number for which in-neighbors have to be obtained
+            @return Numpy array of vertex numbers, once per edge
+            @throws PackageExceptions::VertexError
+        """
+        index = self.getIndex(vertexNumber)
+        return self.vertexNumbers[self.inSources[self.inOffsets[index]:self.inOffsets[index+1]]]
+
+    def getNumberOfOutNeighbors(self, vertexNumber):
+        """ Get number of out-neighbors for a vertex
+
+            @param vertexNumber Vertex number for which number of out-neighbors have to be obtained
+            @return Number of out-neighbors
+            @throws PackageExceptions::VertexError
+        """
+        index = self.getIndex(vertexNumber)
+        return int(self.outOffsets[index+1] - self.outOffsets[index])
+
+    def getNumberOfInNeighbors(self, vertexNumber):
+        """ Get number of in-neighbors for a vertex
+
+            @param vertexNumber Vertex number for which number of in-neighbors have to be obtained
+            @return Number of in-neighbors
+            @throws PackageExceptions::VertexError
+        """
+        index = self.getIndex(vertexNumber)
+        return int(self.inOffsets[index+1] - self.inOffsets[index])
+
+    def getNumberOfNeighbors(self, vertexNumber):
+        """ Get number of neighbors for a vertex
+
+            @param vertexNumber Vertex number for which number of neighbors have to be obtained
+            @return Number of neighbors
+            @throws PackageExceptions::VertexError
+        """
+        return self.getNumberOfOutNeighbors(vertexNumber) + self.getNumberOfInNeighbors(vertexNumber)
+
+    def getOutDegrees(self):
+        """ Get out-degrees of all vertices
+
+            @return Numpy array with the out-degree of every vertex, in the order of CSRGraph::vertexNumbers
+        """
+        return numpy.diff(self.outOffsets)
+
+    def getInDegrees(self):
+        """ Get in-degrees of all vertices
+
+            @return Numpy array with the in-degree of every vertex, in the order of CSRGraph::vertexNumbers
+        """
+        return numpy.diff(self.inOffsets)
+
+    def getDistribution(degrees):
+        """ Counts the vertices of every degree
+
+            @param degrees Numpy array of degrees
+            @return Dictionary indexed on degree. Values are the number of nodes for a degree
+        """
+        values, counts = numpy.unique(degrees, return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+
+    getDistribution = staticmethod(getDistribution)
+
+    def getInDegreeDistribution(self):
+        """ Get in-degree distribution
+
+            @return inDegreeDistribution Dictionary indexed on in-degree. Values are the number of nodes for a in-degree
+        """
+        return CSRGraph.getDistribution(self.getInDegrees())
+
+    def getOutDegreeDistribution(self):
+        """ Get out-degree distribution
+
+            @return outDegreeDistribution Dictionary indexed on out-degree. Values are the number of nodes for a out-degree
+        """
+        return CSRGraph.getDistribution(self.getOutDegrees())
+
+    def getDegreeDistribution(self):
+        """ Get degree distribution. As in Graph::NumberedEdgeDirectedGraph::getDegreeDistribution, vertices without
+            edges are not counted
+
+            @return degreeDistribution Dictionary indexed on degree. Values are the number of nodes for a degree
+        """
+        degrees = self.getOutDegrees() + self.getInDegrees()
+        return CSRGraph.getDistribution(degrees[degrees > 0])
+
+    def getJointDistribution(self):
+        """ Get joint-degree distribution
+
+            @return jointDegreeDistribution Dictionary indexed on out-degree and in-degree. Values are the number of nodes for a given combination of out-degree and in-degree
+        """
+        outDegrees = self.getOutDegrees().astype(numpy.int64)
+        inDegrees = self.getInDegrees().astype(numpy.int64)
+        if not len(outDegrees):
+            return {}
+
+        width = inDegrees.max() + 1
+        keys, counts = numpy.unique(outDegrees*width + inDegrees, return_counts=True)
+
+        jointDistribution = {}
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            jointDistribution.setdefault(key // width, {})[key % width] = count
+        return jointDistribution
+
+    def getVerticesByInDegree(self, degree):
+        """ Gets all the vertices with a particular in-degree
+
+            @param degree In-degree to look for
+            @return Numpy array of vertex numbers
+        """
+        return self.vertexNumbers[self.getInDegrees() == degree]
+
+    def getVerticesByOutDegree(self, degree):
+        """ Gets all the vertices with a particular out-degree
+
+            @param degree Out-degree to look for
+            @return Numpy array of vertex numbers
+        """
+        return self.vertexNumbers[self.getOutDegrees() == degree]
+
+    def getSCComponents(self, getLargest):
+        """ Gets the strongly connected components of a graph. It uses <A HREF="http://en.wikipedia.org/wiki/Tarjan's_strongly_connected_components_algorithm">Tarjan's strongly connected components algorithm.</A>
+            The depth first search keeps its own stack, so it is not limited by the recursion limit
+
+            @param getLargest If greater than 0, only returns the largest connected component
+            @return allSCC List of a List of connected components, given by their vertex numbers
+        """
+        offsets = self.outOffsets.tolist()
+        targets = self.outTargets.tolist()
+        vertexNumbers = self.vertexNumbers
+
+        noOfVertices = len(vertexNumbers)
+        visitNumber = [-1] * noOfVertices
+        lowLinkNumber = [0] * noOfVertices
+        onStack = [False] * noOfVertices
+        stack = []
+        counter = 0
+        allSCC = []
+
+        for root in xrange(noOfVertices):
+            if visitNumber[root] != -1:
+                continue
+
+            visitNumber[root] = lowLinkNumber[root] = counter
+            counter += 1
+            stack.append(root)
+            onStack[root] = True
+
+            # Every entry is a vertex on the search path and the position of its next child in targets
+            path = [[root, offsets[root]]]
+            while path:
+                entry = path[-1]
+                vertex = entry[0]
+                end = offsets[vertex+1]
+                while entry[1] < end:
+                    child = targets[entry[1]]
+                    entry[1] += 1
+                    if visitNumber[child] == -1:
+                        visitNumber[child] = lowLinkNumber[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        onStack[child] = True
+                        path.append([child, offsets[child]])
+                        break
+                    if onStack[child] and visitNumber[child] < lowLinkNumber[vertex]:
+                        lowLinkNumber[vertex] = visitNumber[child]
+                else:
+                    path.pop()
+                    if path and lowLinkNumber[vertex] < lowLinkNumber[path[-1][0]]:
+                        lowLinkNumber[path[-1][0]] = lowLinkNumber[vertex]
+
+                    if lowLinkNumber[vertex] == visitNumber[vertex]:
+                        scc = []
+                        while True:
+                            poppedVertex = stack.pop()
+                            onStack[poppedVertex] = False
+                            scc.append(poppedVertex)
+                            if poppedVertex == vertex:
+                                break
+
+                        if getLargest > 0:
+                            if not allSCC or len(scc) > len(allSCC[0]):
+                                allSCC = [scc]
+                        else:
+                            allSCC.append(scc)
+
+        return [vertexNumbers[scc].tolist() for scc in allSCC]
+
+    def getOutComponent(self, stronglyCC):
+        """ Gives the out component for a strongly connected component
+
+            @param stronglyCC Strongly connected component for which th out-component is to be determined
+            @return outComponent List of the vertex numbers reachable from the component and not in it
+            @throws PackageExceptions::VertexError
+        """
+        outOffsets = self.outOffsets
+        component = self.getIndices(stronglyCC)
+        reached = numpy.zeros(len(self.vertexNumbers), dtype=bool)
+        reached[component] = True
+
+        # Breadth first search, one level of vertices at a time
+        frontier = component
+        while len(frontier):
+            starts = outOffsets[frontier].astype(numpy.int64)
+            counts = outOffsets[frontier+1] - starts
+            ends = numpy.cumsum(counts)
+            positions = numpy.arange(ends[-1]) + numpy.repeat(starts - (ends - counts), counts)
+            children = self.outTargets[positions]
+            frontier = numpy.unique(children[~reached[children]])
+            reached[frontier] = True
+
+        reached[component] = False
+        return self.vertexNumbers[reached].tolist()
+
+    def writeEdges(self, fileName, format):
+        """ Write edges to file
+
+            @param fileName File name to store edges in
+            @param format Format of output file. Can take values: <br>
+                          'simple' = simple format <br>
+                          'dot' = format compatible with 'dot' command
+        """
+        vertexNumbers = self.vertexNumbers
+        startVertices = numpy.repeat(vertexNumbers, self.getOutDegrees()).tolist()
+        endVertices = vertexNumbers[self.outTargets].tolist()
+        if format == 'simple':
+            f = open(fileName,'w')
+            for i in xrange(len(startVertices)):
+                f.write("%s -> %s\n" % (startVertices[i], endVertices[i]))
+            f.close()
+        elif format == 'dot':
+            f = open(fileName,'w')
+            f.write("digraph G { \n")
+            for i in xrange(len(startVertices)):
+                f.write("%s -> %s;\n" % (startVertices[i], endVertices[i]))
+            f.write("} \n")
+            f.close()
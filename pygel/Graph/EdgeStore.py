@@ -0,0 +1,242 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+from pygel.BaseElements.Vertex import *
+from pygel.BaseElements.Edge import *
+from pygel.BaseElements.EdgeView import *
+
+
+class EdgeStore:
+    """ Edge index of a numbered edge graph. Edge numbers are dense, so edge i is stored at position i of two columns
+        of start and end vertex numbers, with a flag marking the deleted edges. Looking up an edge gives a
+        BaseElements::EdgeView made on demand. The store can be used like the dictionary of edges indexed by edge
+        number it replaces, and its columns give all edges at once as numpy arrays
+
+        \ingroup Graph
+    """
+
+    ## Number of edges the columns have room for when the store is made
+    initialCapacity = 1024
+
+    def __init__(self, vertexIndex):
+        """ Constructs an empty store
+
+            @param vertexIndex Dictionary of vertices of the graph, indexed by vertex number. The views take their
+                               vertices from it
+        """
+        ## Dictionary of vertices of the graph, indexed by vertex number
+        self.vertexIndex = vertexIndex
+
+        ## Number of edge numbers used, deleted edges included
+        self.size = 0
+
+        ## Number of edges that are not deleted
+        self.noOfEdges = 0
+
+        ## Numpy array of the start vertex numbers, indexed by edge number. Only the first EdgeStore::size are used
+        self.startVertices = numpy.empty(EdgeStore.initialCapacity, dtype=numpy.int64)
+
+        ## Numpy array of the end vertex numbers, indexed by edge number
+        self.endVertices = numpy.empty(EdgeStore.initialCapacity, dtype=numpy.int64)
+
+        ## Numpy array flagging the deleted edges, indexed by edge number
+        self.deleted = numpy.zeros(EdgeStore.initialCapacity, dtype=bool)
+
+    def reserve(self, size):
+        """ Makes room for edge numbers below size. The columns grow at least by half, so appending edges one by one
+            takes amortized constant time
+
+            @param size Number of edge numbers needed
+        """
+        capacity = len(self.startVertices)
+        if size <= capacity:
+            return
+
+        capacity = max(size, capacity + capacity/2)
+        for name in ['startVertices', 'endVertices', 'deleted']:
+            column = getattr(self, name)
+            grownColumn = numpy.zeros(capacity, dtype=column.dtype)
+            grownColumn[:self.size] = column[:self.size]
+            setattr(self, name, grownColumn)
+
+    def extend(self, startVertices, endVertices):
+        """ Appends edges, numbered from EdgeStore::size on
+
+            @param startVertices Numpy array of start vertex numbers
+            @param endVertices Numpy array of end vertex numbers
+        """
+        size = self.size
+        noOfEdges = len(startVertices)
+        self.reserve(size + noOfEdges)
+        self.startVertices[size:size+noOfEdges] = startVertices
+        self.endVertices[size:size+noOfEdges] = endVertices
+        self.size += noOfEdges
+        self.noOfEdges += noOfEdges
+
+    def getVertex(self, vertexNumber):
+        """ Vertex of the graph with a vertex number. Vertices deleted from the graph are made anew
+
+            @param vertexNumber Vertex number
+            @return Vertex of type BaseElements::Vertex
+        """
+        vertexNumber = int(vertexNumber)
+        try:
+            return self.vertexIndex[vertexNumber]
+        except KeyError:
+            return Vertex(vertexNumber)
+
+    def getColumns(self):
+        """ Get all edges that are not deleted as arrays
+
+            @return Tuple of numpy arrays of the edge numbers, start vertex numbers and end vertex numbers, ordered by
+                    edge number
+        """
+        size = self.size
+        if self.noOfEdges == size:
+            return numpy.arange(size), self.startVertices[:size], self.endVertices[:size]
+
+        edgeNumbers = numpy.nonzero(~self.deleted[:size])[0]
+        return edgeNumbers, self.startVertices[edgeNumbers], self.endVertices[edgeNumbers]
+
+    def __contains__(self, edgeNumber):
+        """ Tells whether an edge number is used by an edge that is not deleted
+        """
+        return 0 <= edgeNumber < self.size and not self.deleted[edgeNumber]
+
+    has_key = __contains__
+
+    def __len__(self):
+        """ Number of edges that are not deleted
+        """
+        return self.noOfEdges
+
+    def __getitem__(self, edgeNumber):
+        """ View of the edge with an edge number. Raises KeyError if there is no such edge
+        """
+        if edgeNumber not in self:
+            raise KeyError(edgeNumber)
+        return EdgeView(self, edgeNumber)
+
+    def get(self, edgeNumber, default=None):
+        """ View of the edge with an edge number, or default if there is no such edge
+        """
+        if edgeNumber not in self:
+            return default
+        return EdgeView(self, edgeNumber)
+
+    def __setitem__(self, edgeNumber, edge):
+        """ Stores an edge under an edge number. Edge numbers skipped over are deleted edges
+
+            @param edgeNumber Edge number
+            @param edge Edge of type BaseElements::Edge or BaseElements::EdgeView
+        """
+        if edgeNumber >= self.size:
+            self.reserve(edgeNumber + 1)
+            self.deleted[self.size:edgeNumber] = True
+            self.size = edgeNumber + 1
+        elif edgeNumber in self:
+            self.noOfEdges -= 1
+
+        self.startVertices[edgeNumber] = edge.startVertex.vertexNumber
+        self.endVertices[edgeNumber] = edge.endVertex.vertexNumber
+        self.deleted[edgeNumber] = False
+        self.noOfEdges += 1
+
+    def __delitem__(self, edgeNumber):
+        """ Deletes an edge. Its edge number is not used again
+        """
+        if edgeNumber not in self:
+            raise KeyError(edgeNumber)
+        self.deleted[edgeNumber] = True
+        self.noOfEdges -= 1
+
+    def iterkeys(self):
+        """ Iterates over the edge numbers in increasing order
+        """
+        return iter(self.getColumns()[0].tolist())
+
+    __iter__ = iterkeys
+
+    def itervalues(self):
+        """ Iterates over views of the edges in the order of their edge numbers
+        """
+        for edgeNumber in self.iterkeys():
+            yield EdgeView(self, edgeNumber)
+
+    def iteritems(self):
+        """ Iterates over the edge numbers and views of the edges
+        """
+        for edgeNumber in self.iterkeys():
+            yield edgeNumber, EdgeView(self, edgeNumber)
+
+    def keys(self):
+        """ List of the edge numbers
+        """
+        return self.getColumns()[0].tolist()
+
+    def values(self):
+        """ List of views of the edges
+        """
+        return list(self.itervalues())
+
+    def items(self):
+        """ List of the edge numbers and views of the edges
+        """
+        return list(self.iteritems())
+
+    def update(self, edges):
+        """ Stores edges under their edge numbers
+
+            @param edges Dictionary of edges indexed by edge number, or sequence of pairs of edge number and edge
+        """
+        if hasattr(edges, 'iteritems'):
+            edges = edges.iteritems()
+        for edgeNumber, edge in edges:
+            self[edgeNumber] = edge
+
+    def pop(self, edgeNumber, *default):
+        """ Deletes an edge and returns it as a BaseElements::Edge, since a view would follow the edge number. Returns
+            default, if given, when there is no such edge, else raises KeyError
+        """
+        if edgeNumber not in self:
+            if default:
+                return default[0]
+            raise KeyError(edgeNumber)
+        edge = Edge(self.getVertex(self.startVertices[edgeNumber]), self.getVertex(self.endVertices[edgeNumber]))
+        del self[edgeNumber]
+        return edge
+
+    def setdefault(self, edgeNumber, edge):
+        """ View of the edge with an edge number, after storing edge under it if there is no such edge
+        """
+        if edgeNumber not in self:
+            self[edgeNumber] = edge
+        return EdgeView(self, edgeNumber)
+
+    def clear(self):
+        """ Deletes all edges. Their edge numbers are not used again
+        """
+        self.deleted[:self.size] = True
+        self.noOfEdges = 0
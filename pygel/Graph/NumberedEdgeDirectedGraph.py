@@ -23,7 +23,12 @@
 
 
 from AbstractGraph import *
+from CSRGraph import *
 from sets import Set
+from itertools import izip
+from EdgeStore import *
+import gc
+import numpy
 from random import randint, choice
 from pygel.BaseElements.Edge import *
 from pygel.BaseElements.Vertex import *
@@ -40,17 +45,20 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
     def __init__(self):
         """ Constructs a numbered edge graph
         """
-        ## Dictionary of edges, indexed by edge number
-        self.edgeIndex = {}
-
         ## Dictionary of vertices, indexed by vertex number
         self.vertexIndex = {}
 
+        ## Edges, indexed by edge number. Graph::EdgeStore used like a dictionary of edges
+        self.edgeIndex = EdgeStore(self.vertexIndex)
+
         ## Dictionary of vertices, indexed by parent
         self.parentIndex = {}
 
         ## Dictionary of vertices and edge numbers, indexed by parent
-        self.parentEdgeIndex = {}        
+        self.parentEdgeIndex = {}
+
+        ## Dictionary of parent vertices, indexed by child. Used for finding in-neighbors without going over all edges
+        self.childIndex = {}        
         
         ## Last edge number assigned
         self.__lastEdgeNumber = -1
@@ -82,6 +90,7 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
         vertexIndex = self.vertexIndex
         parentIndex = self.parentIndex
         parentEdgeIndex = self.parentEdgeIndex
+        childIndex = self.childIndex
 
         if startVertexNumber not in vertexIndex:
             vertexIndex[startVertexNumber] = startVertex
@@ -95,6 +104,11 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
         else:
             parentIndex[startVertexNumber].append(endVertexNumber)
 
+        if endVertexNumber not in childIndex:
+            childIndex[endVertexNumber] = [startVertexNumber]
+        else:
+            childIndex[endVertexNumber].append(startVertexNumber)
+
         if startVertexNumber not in parentEdgeIndex:
             parentEdgeIndex[startVertexNumber] = [[endVertexNumber, self.__lastEdgeNumber]]
         else:
@@ -103,19 +117,92 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
             
         try:
             self.__outDegreeCount[startVertexNumber] += 1
-            self.__degreeCount[startVertexNumber] += 1
         except KeyError:
             self.__outDegreeCount[startVertexNumber] = 1
+
+        try:
+            self.__degreeCount[startVertexNumber] += 1
+        except KeyError:
             self.__degreeCount[startVertexNumber] = 1
             
         try:
             self.__inDegreeCount[endVertexNumber] += 1
-            self.__degreeCount[endVertexNumber] += 1
         except KeyError:
             self.__inDegreeCount[endVertexNumber] = 1
+
+        try:
+            self.__degreeCount[endVertexNumber] += 1
+        except KeyError:
             self.__degreeCount[endVertexNumber] = 1
             
 
+    def addEdges(self, startVertexNumbers, endVertexNumbers):
+        """ Adds many edges at once. The indices end up as with NumberedEdgeDirectedGraph::addEdge for every edge in
+            turn, but they are built with sorted passes over the edges, so the dictionaries are only touched once per
+            vertex, and the edges are appended to the columns of the edge store
+
+            @param startVertexNumbers Start vertex numbers of the edges, as a list or numpy array
+            @param endVertexNumbers End vertex numbers of the edges, as a list or numpy array
+        """
+        startVertices = numpy.asarray(startVertexNumbers, dtype=numpy.int64)
+        endVertices = numpy.asarray(endVertexNumbers, dtype=numpy.int64)
+        noOfEdges = len(startVertices)
+        if not noOfEdges:
+            return
+
+        # The objects made here hold no reference cycles, so the cyclic garbage collector is paused rather than
+        # scanning the growing indices again and again
+        gcWasEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            firstEdgeNumber = self.__lastEdgeNumber + 1
+            self.__lastEdgeNumber += noOfEdges
+
+            vertexIndex = self.vertexIndex
+            for vertexNumber in numpy.unique(numpy.concatenate([startVertices, endVertices])).tolist():
+                if vertexNumber not in vertexIndex:
+                    vertexIndex[vertexNumber] = Vertex(vertexNumber)
+
+            self.edgeIndex.extend(startVertices, endVertices)
+
+            # A stable sort by start vertex keeps the children of every parent in the order of the edges
+            order = numpy.argsort(startVertices, kind='mergesort')
+            parents, groupStarts, outDegrees = numpy.unique(startVertices[order], return_index=True, return_counts=True)
+            children = endVertices[order].tolist()
+            childEdgeNumbers = (order + firstEdgeNumber).tolist()
+
+            parentIndex = self.parentIndex
+            parentEdgeIndex = self.parentEdgeIndex
+            for parent, start, end in izip(parents.tolist(), groupStarts.tolist(), (groupStarts + outDegrees).tolist()):
+                parentIndex.setdefault(parent, []).extend(children[start:end])
+                parentEdgeIndex.setdefault(parent, []).extend(map(list, izip(children[start:end],
+                                                                             childEdgeNumbers[start:end])))
+
+            # The parents of every child are grouped the same way
+            order = numpy.argsort(endVertices, kind='mergesort')
+            childNumbers, childStarts, inDegrees = numpy.unique(endVertices[order], return_index=True,
+                                                                return_counts=True)
+            childParents = startVertices[order].tolist()
+
+            childIndex = self.childIndex
+            childEnds = childStarts + inDegrees
+            for child, start, end in izip(childNumbers.tolist(), childStarts.tolist(), childEnds.tolist()):
+                childIndex.setdefault(child, []).extend(childParents[start:end])
+
+            outDegreeCount = self.__outDegreeCount
+            inDegreeCount = self.__inDegreeCount
+            degreeCount = self.__degreeCount
+            for vertexNumber, degree in izip(parents.tolist(), outDegrees.tolist()):
+                outDegreeCount[vertexNumber] = outDegreeCount.get(vertexNumber, 0) + degree
+                degreeCount[vertexNumber] = degreeCount.get(vertexNumber, 0) + degree
+
+            for vertexNumber, degree in izip(childNumbers.tolist(), inDegrees.tolist()):
+                inDegreeCount[vertexNumber] = inDegreeCount.get(vertexNumber, 0) + degree
+                degreeCount[vertexNumber] = degreeCount.get(vertexNumber, 0) + degree
+        finally:
+            if gcWasEnabled:
+                gc.enable()
+
     def deleteEdge(self, edgeNumber):
         """ Delete an edge
 
@@ -140,6 +227,9 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
         if startVertexNumber in parentEdgeIndex:
             # TODO: throws exception
             parentEdgeIndex[startVertexNumber].remove([endVertexNumber, edgeNumber])
+
+        if endVertexNumber in self.childIndex:
+            self.childIndex[endVertexNumber].remove(startVertexNumber)
             
         try:
             self.__outDegreeCount[startVertexNumber] -= 1
@@ -178,7 +268,7 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
     def getEdges(self):
         """ Get all graph edges
 
-            @return edgeIndex Dictionary of edges, indexed by edge number
+            @return edgeIndex Graph::EdgeStore of the edges, used like a dictionary of edges indexed by edge number
         """
         return self.edgeIndex
 
@@ -202,12 +292,8 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
             @param vertexNumber Vertex number for which out-neighbors have to be obtained
             @return outNeighbors List of out-neighbors. Each element of type BaseElements::Vertex
         """
-        outNeighbors = []
-        edges = self.edgeIndex.values()
-        for edge in edges:
-            if edge.startVertex.vertexNumber == vertexNumber:
-                outNeighbors.append(edge.startVertex)
-        return outNeighbors
+        getVertex = self.edgeIndex.getVertex
+        return [getVertex(neighborNumber) for neighborNumber in self.parentIndex.get(vertexNumber, [])]
 
     def getInNeighbors(self, vertexNumber):
         """ Get in-neighbors for a vertex
@@ -215,12 +301,8 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
             @param vertexNumber Vertex number for which in-neighbors have to be obtained
             @return inNeighbors List of in-neighbors. Each element of type BaseElements::Vertex
         """
-        inNeighbors = []
-        edges = self.edgeIndex.values()
-        for edge in edges:
-            if edge.endVertex.vertexNumber == vertexNumber:
-                inNeighbors.append(endVertex)
-        return inNeighbors
+        getVertex = self.edgeIndex.getVertex
+        return [getVertex(neighborNumber) for neighborNumber in self.childIndex.get(vertexNumber, [])]
 
     def getNumberOfOutNeighbors(self, vertexNumber):
         """ Get number of out-neighbors for a vertex
@@ -520,6 +602,14 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
 
         return outComponent
 
+    def freeze(self):
+        """ Makes an immutable copy of the graph in compressed sparse row form. It answers the same queries with a
+            fraction of the memory, and later changes of this graph do not affect it
+
+            @return Graph::CSRGraph
+        """
+        return CSRGraph.fromEdgeIndex(self.edgeIndex, self.vertexIndex.iterkeys())
+
     def writeCC(self, fileName, allSCC):
         """ Write the connected components to a file
 
@@ -542,17 +632,16 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
                           'dot' = format compatible with 'dot' command
                           
         """
-        edges = self.edgeIndex.values()
+        edgeNumbers, startVertices, endVertices = self.edgeIndex.getColumns()
+        edges = izip(startVertices.tolist(), endVertices.tolist())
         if format == 'simple':
             f = open(fileName,'w')
-            for edge in edges:
-                f.write("%s -> %s\n" % (edge.startVertex.vertexNumber, edge.endVertex.vertexNumber))
+            f.writelines("%s -> %s\n" % edge for edge in edges)
             f.close()
         elif format == 'dot':
             f = open(fileName,'w')
             f.write("digraph G { \n")
-            for edge in edges:
-                f.write("%s -> %s;\n" % (edge.startVertex.vertexNumber, edge.endVertex.vertexNumber))
+            f.writelines("%s -> %s;\n" % edge for edge in edges)
             f.write("} \n")
             f.close()
 
@@ -569,10 +658,13 @@ class NumberedEdgeDirectedGraph(AbstractGraph):
 
             if edgesRaw[-1] == '': edgesRaw = edgesRaw[:-1]
 
+            startVertexNumbers = []
+            endVertexNumbers = []
             for edge in edgesRaw:
                 [startVertex, endVertex] = edge.split("->")
-                newEdge = Edge(Vertex(int(startVertex)), Vertex(int(endVertex)))
-                self.addEdge(newEdge)
+                startVertexNumbers.append(int(startVertex))
+                endVertexNumbers.append(int(endVertex))
+            self.addEdges(startVertexNumbers, endVertexNumbers)
 
     def findEdge(self, edgeNumber):
         """ Find edge with a given edge number
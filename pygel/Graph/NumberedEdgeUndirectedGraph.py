@@ -29,7 +29,11 @@ from pygel.BaseElements.Edge import *
 from pygel.BaseElements.Vertex import *
 from pygel.Exceptions.Exceptions import *
 from pygel.System.PyGelLogging import *
+from itertools import izip, chain
+from EdgeStore import *
+import gc
 import time
+import numpy
 
 
 class NumberedEdgeUndirectedGraph(AbstractGraph):
@@ -46,12 +50,12 @@ class NumberedEdgeUndirectedGraph(AbstractGraph):
     def __init__(self):
         """ Constructs a numbered edge graph
         """
-        ## Dictionary of edges, indexed by edge number
-        self.edgeIndex = {}
-
         ## Dictionary of vertices, indexed by vertex number
         self.vertexIndex = {}
 
+        ## Edges, indexed by edge number. Graph::EdgeStore used like a dictionary of edges
+        self.edgeIndex = EdgeStore(self.vertexIndex)
+
         ## Dictionary of vertices, indexed by parent
         self.parentIndex = {}
 
@@ -130,6 +134,137 @@ class NumberedEdgeUndirectedGraph(AbstractGraph):
                 self.__degreeCount[endVertexNumber] = 1
         
             
+    def addEdges(self, startVertexNumbers, endVertexNumbers, skipInvalid=1):
+        """ Adds many edges at once. The indices end up as with NumberedEdgeUndirectedGraph::addEdge for every edge in
+            turn, but they are built with sorted passes over the edges, so the dictionaries are only touched once per
+            vertex, and the edges are appended to the columns of the edge store
+
+            @param startVertexNumbers Start vertex numbers of the edges, as a list or numpy array
+            @param endVertexNumbers End vertex numbers of the edges, as a list or numpy array
+            @param skipInvalid If true (set to 1) self loops and edges that already exist, also earlier in the same
+                               call, are logged and skipped. Otherwise the edges before the first of them are added
+                               and PackageExceptions::EdgeError is raised for it, as with
+                               NumberedEdgeUndirectedGraph::addEdge
+            @throws PackageExceptions::EdgeError
+        """
+        startVertices = numpy.asarray(startVertexNumbers, dtype=numpy.int64)
+        endVertices = numpy.asarray(endVertexNumbers, dtype=numpy.int64)
+        noOfEdges = len(startVertices)
+        if not noOfEdges:
+            return
+
+        # Among the edges between the same pair of vertices only the first one is kept. The existing edges of the
+        # lower vertices of the new edges are taken from the parent index and sorted in before the new ones, so a new
+        # edge between the vertices of an existing edge is repeated as well, without going over all edges
+        lowVertices = numpy.minimum(startVertices, endVertices)
+        highVertices = numpy.maximum(startVertices, endVertices)
+        parentIndex = self.parentIndex
+        oldLowVertices = numpy.unique(lowVertices)
+        neighborLists = [parentIndex.get(vertexNumber, []) for vertexNumber in oldLowVertices.tolist()]
+        noOfNeighbors = numpy.array([len(neighbors) for neighbors in neighborLists], dtype=numpy.int64)
+        noOfOldEdges = int(noOfNeighbors.sum())
+        oldLowVertices = numpy.repeat(oldLowVertices, noOfNeighbors)
+        oldHighVertices = numpy.fromiter(chain.from_iterable(neighborLists), dtype=numpy.int64, count=noOfOldEdges)
+
+        lowVertices = numpy.concatenate([oldLowVertices, lowVertices])
+        highVertices = numpy.concatenate([oldHighVertices, highVertices])
+        order = numpy.lexsort((numpy.arange(len(lowVertices)), highVertices, lowVertices))
+        repeated = numpy.zeros(len(lowVertices), dtype=bool)
+        repeated[order[1:]] = (lowVertices[order[1:]] == lowVertices[order[:-1]]) & \
+                              (highVertices[order[1:]] == highVertices[order[:-1]])
+        selfLoops = startVertices == endVertices
+        accepted = ~(repeated[noOfOldEdges:] | selfLoops)
+
+        rejected = numpy.nonzero(~accepted)[0].tolist()
+        if rejected and not skipInvalid:
+            firstRejected = rejected[0]
+            self.addEdges(startVertices[:firstRejected], endVertices[:firstRejected])
+            raise self.getRejectionError(startVertices[firstRejected], endVertices[firstRejected])
+
+        for i in rejected:
+            self.logger.info(self.getRejectionError(startVertices[i], endVertices[i]).message)
+
+        startVertices = startVertices[accepted]
+        endVertices = endVertices[accepted]
+        noOfEdges = len(startVertices)
+        if not noOfEdges:
+            return
+
+        # The objects made here hold no reference cycles, so the cyclic garbage collector is paused rather than
+        # scanning the growing indices again and again
+        gcWasEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            firstEdgeNumber = self.__lastEdgeNumber + 1
+            self.__lastEdgeNumber += noOfEdges
+            edgeNumbers = numpy.arange(firstEdgeNumber, firstEdgeNumber + noOfEdges)
+
+            vertexIndex = self.vertexIndex
+            for vertexNumber in numpy.unique(numpy.concatenate([startVertices, endVertices])).tolist():
+                if vertexNumber not in vertexIndex:
+                    vertexIndex[vertexNumber] = Vertex(vertexNumber)
+
+            self.edgeIndex.extend(startVertices, endVertices)
+
+            # Every edge is a child of both of its vertices. Sorting by parent and edge number keeps the children of
+            # every parent in the order of the edges
+            parents = numpy.concatenate([startVertices, endVertices])
+            children = numpy.concatenate([endVertices, startVertices])
+            childEdgeNumbers = numpy.concatenate([edgeNumbers, edgeNumbers])
+            order = numpy.lexsort((childEdgeNumbers, parents))
+            parents, groupStarts, degrees = numpy.unique(parents[order], return_index=True, return_counts=True)
+            children = children[order].tolist()
+            childEdgeNumbers = childEdgeNumbers[order].tolist()
+
+            parentEdgeIndex = self.parentEdgeIndex
+            degreeCount = self.__degreeCount
+            for parent, start, degree in izip(parents.tolist(), groupStarts.tolist(), degrees.tolist()):
+                end = start + degree
+                parentIndex.setdefault(parent, []).extend(children[start:end])
+                parentEdgeIndex.setdefault(parent, []).extend(map(list, izip(children[start:end],
+                                                                             childEdgeNumbers[start:end])))
+                degreeCount[parent] = degreeCount.get(parent, 0) + degree
+        finally:
+            if gcWasEnabled:
+                gc.enable()
+
+    def getRejectionError(self, startVertexNumber, endVertexNumber):
+        """ Error for an edge that NumberedEdgeUndirectedGraph::addEdges does not add
+
+            @param startVertexNumber Start vertex number of the edge
+            @param endVertexNumber End vertex number of the edge
+            @return PackageExceptions::EdgeError for a self loop or for an edge that already exists
+        """
+        message = ErrorMessages.edgeAlreadyExists
+        if startVertexNumber == endVertexNumber:
+            message = ErrorMessages.noSelfLoops
+        return EdgeError(int(startVertexNumber), int(endVertexNumber), message)
+
+    def getUniqueEdges(serialEdgeList, size):
+        """ Removes duplicate edges from a serial edge list. An edge duplicates an earlier edge between the same pair of
+            vertices, in either direction. Used by the undirected random graphs before populating a graph
+
+            @param serialEdgeList Numpy array of alternating start and end vertex numbers
+            @param size Largest vertex number
+            @return Numpy array of the first occurrences of the edges, in their original order
+        """
+        startVertices = serialEdgeList[0::2].astype(numpy.int64)
+        endVertices = serialEdgeList[1::2].astype(numpy.int64)
+        keys = numpy.minimum(startVertices, endVertices) * (size + 1) + numpy.maximum(startVertices, endVertices)
+        if len(keys) == 0:
+            return serialEdgeList
+
+        # A stable sort is several times slower than quicksort here, so the first edge of every run of equal keys is
+        # found as the smallest index of the run instead
+        order = numpy.argsort(keys)
+        sortedKeys = keys[order]
+        runStarts = numpy.concatenate(([0], numpy.nonzero(sortedKeys[1:] != sortedKeys[:-1])[0] + 1))
+        firstIndices = numpy.minimum.reduceat(order, runStarts)
+        firstIndices.sort()
+        return serialEdgeList.reshape(-1, 2)[firstIndices].ravel()
+
+    getUniqueEdges = staticmethod(getUniqueEdges)
+
     def deleteEdge(self, edgeNumber):
         """ Delete an edge
 
@@ -198,7 +333,7 @@ class NumberedEdgeUndirectedGraph(AbstractGraph):
     def getEdges(self):
         """ Get all graph edges
 
-            @return edgeIndex Dictionary of edges, indexed by edge number
+            @return edgeIndex Graph::EdgeStore of the edges, used like a dictionary of edges indexed by edge number
         """
         return self.edgeIndex
 
@@ -232,10 +367,11 @@ class NumberedEdgeUndirectedGraph(AbstractGraph):
         parentIndex = self.parentIndex
         neighborNumbers = parentIndex[vertexNumber]
 
+        vertexIndex = self.vertexIndex
         neighbors = []
         
         for neighborNumber in neighborNumbers:
-            neighbors.append(Vertex(neighborNumber))
+            neighbors.append(vertexIndex[neighborNumber])
         return neighbors
 
 
@@ -347,17 +483,16 @@ class NumberedEdgeUndirectedGraph(AbstractGraph):
                           'dot' = format compatible with 'dot' command
                           
         """
-        edges = self.edgeIndex.values()
+        edgeNumbers, startVertices, endVertices = self.edgeIndex.getColumns()
+        edges = izip(startVertices.tolist(), endVertices.tolist())
         if format == 'simple':
             f = open(fileName,'w')
-            for edge in edges:
-                f.write("%s -- %s\n" % (edge.startVertex.vertexNumber, edge.endVertex.vertexNumber))
+            f.writelines("%s -- %s\n" % edge for edge in edges)
             f.close()
         elif format == 'dot':
             f = open(fileName,'w')
             f.write("graph G { \n")
-            for edge in edges:
-                f.write("%s -- %s;\n" % (edge.startVertex.vertexNumber, edge.endVertex.vertexNumber))
+            f.writelines("%s -- %s;\n" % edge for edge in edges)
             f.write("} \n")
             f.close()
 
@@ -367,6 +502,7 @@ class NumberedEdgeUndirectedGraph(AbstractGraph):
             @param fileName File name to read edges from
             @param format Format of input file. Can take values: <br>
                           'simple' = simple format
+            @throws PackageExceptions::EdgeError
         """
         f = open(fileName)
         if format == 'simple':
@@ -374,10 +510,13 @@ class NumberedEdgeUndirectedGraph(AbstractGraph):
 
             if edgesRaw[-1] == '': edgesRaw = edgesRaw[:-1]
 
+            startVertexNumbers = []
+            endVertexNumbers = []
             for edge in edgesRaw:
                 [startVertex, endVertex] = edge.split("--")
-                newEdge = Edge(Vertex(int(startVertex)), Vertex(int(endVertex)))
-                self.addEdge(newEdge)
+                startVertexNumbers.append(int(startVertex))
+                endVertexNumbers.append(int(endVertex))
+            self.addEdges(startVertexNumbers, endVertexNumbers, 0)
 
     def findEdge(self, edgeNumber):
         """ Find edge with a given edge number
@@ -27,6 +27,6 @@
     \defgroup Graph Graph
 """
 
-__all__ = ['NumberedEdgeDirectedGraph', 'NumberedEdgeUndirectedGraph']
+__all__ = ['NumberedEdgeDirectedGraph', 'NumberedEdgeUndirectedGraph', 'CSRGraph', 'EdgeStore']
 
 
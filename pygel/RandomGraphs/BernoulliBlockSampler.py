@@ -0,0 +1,118 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+
+
+class BernoulliBlockSampler:
+    """ Vectorized sampler for adjacency matrices made of blocks with a constant edge probability, as in stochastic
+        block models and bucketed Chung-Lu graphs. The rows and columns are split into consecutive groups, and every
+        cell of the block of row group i and column group j is an edge with probability probs[i][j]. The cells of a
+        block are numbered row by row and the chosen ones are found by geometric skipping as in Batagelj and Brandes,
+        "Efficient generation of large random networks" (2005). The skips of all blocks are drawn together, so the
+        time is linear in the number of blocks plus edges and no work is done per cell
+
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, rowSizes, columnSizes, probs):
+        """ Constructs a sampler
+
+            @param rowSizes Sizes of the row groups
+            @param columnSizes Sizes of the column groups
+            @param probs Edge probabilities of the blocks, indexed by row group and column group. Values above one are
+                         treated as one
+        """
+        ## Sizes of the row groups. Numpy array
+        self.rowSizes = numpy.asarray(rowSizes, dtype=numpy.int64)
+
+        ## Sizes of the column groups. Numpy array
+        self.columnSizes = numpy.asarray(columnSizes, dtype=numpy.int64)
+
+        ## Edge probabilities of the blocks. Numpy array of shape (row groups, column groups)
+        self.probs = numpy.clip(numpy.asarray(probs, dtype=numpy.float64), 0, 1)
+
+    def sample(self, randomState):
+        """ Samples the edges of all blocks
+
+            @param randomState numpy.random.RandomState used for drawing the skips
+            @return Tuple of two numpy arrays holding the rows and columns of the edges, counted from 0
+        """
+        rowSizes = self.rowSizes
+        columnSizes = self.columnSizes
+        blocks, cells = BernoulliBlockSampler.sampleCells(numpy.outer(rowSizes, columnSizes).ravel(),
+                                                          self.probs.ravel(), randomState)
+
+        # Cell c of a block is at row c // width and column c % width of the block
+        rowGroups = blocks // len(columnSizes)
+        columnGroups = blocks % len(columnSizes)
+        widths = columnSizes[columnGroups]
+        rows = (numpy.cumsum(rowSizes) - rowSizes)[rowGroups] + cells // widths
+        columns = (numpy.cumsum(columnSizes) - columnSizes)[columnGroups] + cells % widths
+        return rows, columns
+
+    def sampleCells(cellCounts, probs, randomState):
+        """ Chooses every cell of every block independently with the probability of its block
+
+            @param cellCounts Numpy array with the number of cells of every block
+            @param probs Numpy array with the probability of every block
+            @param randomState numpy.random.RandomState used for drawing the skips
+            @return Tuple of two numpy arrays holding the block and the cell within the block of every chosen cell
+        """
+        chosenBlocks = []
+        chosenCells = []
+
+        # Every round draws a little more than the expected number of skips of the unfinished blocks, so most blocks
+        # are finished after the first round. Blocks start before their first cell
+        active = numpy.nonzero((cellCounts > 0) & (probs > 0))[0]
+        lastCells = numpy.empty(len(cellCounts), dtype=numpy.int64)
+        lastCells.fill(-1)
+        while len(active):
+            remainingCells = cellCounts[active] - 1 - lastCells[active]
+            expectedSkips = remainingCells * probs[active]
+            noOfSkips = numpy.minimum(remainingCells + 1,
+                                      (expectedSkips + 4*numpy.sqrt(expectedSkips) + 2).astype(numpy.int64))
+
+            # numpy's geometric distribution counts the trials up to and including the first success, so it is the
+            # distance from one chosen cell to the next
+            blocks = numpy.repeat(active, noOfSkips)
+            skips = randomState.geometric(probs[blocks])
+            cells = numpy.cumsum(skips)
+
+            # Turn the running sum over all blocks into a running sum per block starting at the last cell of the block
+            ends = numpy.cumsum(noOfSkips)
+            starts = ends - noOfSkips
+            cells += numpy.repeat(lastCells[active] - (cells[starts] - skips[starts]), noOfSkips)
+
+            keep = cells < cellCounts[blocks]
+            chosenBlocks.append(blocks[keep])
+            chosenCells.append(cells[keep])
+
+            lastCells[active] = cells[ends - 1]
+            active = active[lastCells[active] < cellCounts[active]]
+
+        return numpy.concatenate([numpy.empty(0, dtype=numpy.int64)] + chosenBlocks), \
+               numpy.concatenate([numpy.empty(0, dtype=numpy.int64)] + chosenCells)
+
+    sampleCells = staticmethod(sampleCells)
@@ -22,6 +22,8 @@
 #
 
 import threading, random
+import numpy
+from RMATSampler import *
 
 
 class ChooseEdges(threading.Thread):
@@ -30,19 +32,27 @@ class ChooseEdges(threading.Thread):
         \ingroup RandomGraphs
 
     """
-    ## Common serial edge list. Updated by each thread in a semaphoric operation
-    serialEdgeList = []
-
-    ## Lock that a thread acquires for performing a semaphoric operation
-    lck = threading.Lock()
-    evnt = threading.Event()
-
     ## Thread ID
     id = 0
 
-    def __init__(self, noOfEdges, noSelfLoops, startVertX, endVertX, startVertY, endVertY, probA, probB, probC, probD):
+    ## Number of edges sampled at once by the sampler
+    blockSize = 65536
+
+    def __init__(self, noOfEdges, noSelfLoops, startVertX, endVertX, startVertY, endVertY, probA, probB, probC, probD,
+                 seed=None, index=0, edgeQueue=None, sampler=None,
+                 permutation=None, progress=None):
         """ Constructs a selector thread
 
+            @param seed Seed of the whole generation. If None, the edges are not reproducible
+            @param index Index of this thread. Selects its random number stream
+            @param edgeQueue Bounded Queue.Queue receiving the selected edges block by block. If None, the edges are
+                             kept in ChooseEdges::serialEdgeList
+            @param sampler Sampler of the edges, e.g. RandomGraphs::KroneckerSampler. If None, a RandomGraphs::RMATSampler
+                           for the adjacency matrix and quadrant probabilities is used
+            @param permutation RandomGraphs::VertexPermutation applied to the vertex numbers of every block. If None, the
+                               vertex numbers are not permuted
+            @param progress Started RandomGraphs::GenerationProgress counting the edges of every block under index.
+                            If None, progress is not reported
             @see RandomGraphs::DirectedPowerLawRandomGraph
         """
 
@@ -79,6 +89,33 @@ class ChooseEdges(threading.Thread):
         ## @see RandomGraphs::DirectedPowerLawRandomGraph
         self.noSelfLoops = noSelfLoops
 
+        ## Seed of the whole generation
+        self.seed = seed
+
+        ## Index of this thread. Selects its random number stream
+        self.index = index
+
+        ## Serial edge list of the edges selected by this thread. Numpy array of RMATSampler::getVertexType
+        self.serialEdgeList = None
+
+        ## Queue receiving the selected edges block by block. Ends with None
+        self.edgeQueue = edgeQueue
+
+        ## Sampler of the edges. If None, a RandomGraphs::RMATSampler is used
+        self.sampler = sampler
+
+        ## Permutation of the vertex numbers. If None, the vertex numbers are not permuted
+        self.permutation = permutation
+
+        ## Progress monitor. If None, progress is not reported
+        self.progress = progress
+
+        ## Exception the thread stopped with, or None if it did not fail
+        self.error = None
+
+        ## If true (set to 1) the thread stops putting blocks on ChooseEdges::edgeQueue
+        self.cancelled = 0
+
         ChooseEdges.id += 1
 
         ## Thread ID
@@ -86,7 +123,8 @@ class ChooseEdges(threading.Thread):
         
 
     def selectVertex(self, sVertX, eVertX, sVertY, eVertY, cumulativeA, cumulativeB, cumulativeC):
-        """ Selects start and end vertices recursively
+        """ Selects start and end vertices recursively. Reference implementation of RandomGraphs::RMATSampler, which
+            is used by ChooseEdges::run
 
             @param sVertX Starting column of the adjacency matrix
             @param eVertX Ending column of the adjacency matrix
@@ -160,49 +198,91 @@ class ChooseEdges(threading.Thread):
         return self.selectVertex(sVertX, eVertX, sVertY, eVertY, cumulativeA, cumulativeB, cumulativeC)
 
     
-    def run(self):
-        """ Start the thread
+    def selectEdges(self):
+        """ Selects the edges of this thread. Edges are sampled in blocks of ChooseEdges::blockSize by
+            RandomGraphs::RMATSampler
+
+            @return serialEdgeList Numpy array of alternating start and end vertex numbers
         """
-        threadEdgeList = []
+        serialEdgeList = numpy.empty(2*self.noOfEdges, dtype=RMATSampler.getVertexType(self.endVertX, self.endVertY))
 
-        step = int(0.05*self.noOfEdges)
-        if step == 0:
-            progressBar = xrange(0,self.noOfEdges,1)
-        else:
-            progressBar = xrange(0,self.noOfEdges,int(0.05*self.noOfEdges))
+        position = 0
+        for block in self.sampleBlocks():
+            serialEdgeList[position:position+len(block)] = block
+            position += len(block)
 
-        noOfEdges = self.noOfEdges
-        
-        startVertX = self.startVertX
-        endVertX = self.endVertX
-        startVertY = self.startVertY
-        endVertY = self.endVertY
-        id = self.id
-        selectVertex = self.selectVertex
-
-        cumulativeA = self.probA
-        cumulativeB = cumulativeA + self.probB
-        cumulativeC = cumulativeB + self.probC
-        
-        threadEdgeListAppend = threadEdgeList.append
-        
-        for i in xrange(0,noOfEdges):
+        return serialEdgeList[:position]
 
-#            if i in progressBar:
-#               print "Thread id %s, |--> %s edges added<--|" % (id, i)
+    def sampleBlocks(self):
+        """ Samples the edges of this thread in blocks of ChooseEdges::blockSize
 
-            a = selectVertex(startVertX, endVertX, startVertY, endVertY, cumulativeA, cumulativeB, cumulativeC)
-            startVertexNumber = min(a[0:1])
-            endVertexNumber = min(a[2:3])
-            
-            if self.noSelfLoops == 0: 
-                threadEdgeListAppend(startVertexNumber)
-                threadEdgeListAppend(endVertexNumber)
-            elif startVertexNumber != endVertexNumber:
-                threadEdgeListAppend(startVertexNumber)
-                threadEdgeListAppend(endVertexNumber)
-            
-        ChooseEdges.lck.acquire()
-        ChooseEdges.serialEdgeList.extend(threadEdgeList)
-        ChooseEdges.lck.release()
+            @return Iterator over numpy arrays of alternating start and end vertex numbers
+        """
+        sampler = self.sampler
+        if sampler is None:
+            sampler = RMATSampler(self.startVertX, self.endVertX, self.startVertY, self.endVertY,
+                                  self.probA, self.probB, self.probC, self.probD)
+        randomState = RMATSampler.getRandomState(self.seed, self.index)
+
+        blocks = sampler.sampleBlocks(self.noOfEdges, self.noSelfLoops, randomState, ChooseEdges.blockSize,
+                                      self.permutation)
+        if self.progress is None:
+            return blocks
+        return ChooseEdges.countBlocks(blocks, self.progress, self.index)
+
+    def countBlocks(blocks, progress, index):
+        """ Reports the edges of every block to a progress monitor once the block has been handed on, i.e. when the
+            next block is asked for
+
+            @param blocks Iterator over numpy arrays of alternating start and end vertex numbers
+            @param progress RandomGraphs::GenerationProgress
+            @param index Index of the worker
+            @return Iterator over the same blocks
+        """
+        for block in blocks:
+            yield block
+            progress.update(index, len(block)/2)
+
+    countBlocks = staticmethod(countBlocks)
+
+    def run(self):
+        """ Start the thread. The selected edges are stored in ChooseEdges::serialEdgeList or, when streaming, put on
+            ChooseEdges::edgeQueue followed by None. If the thread fails, the exception is kept in ChooseEdges::error
+            and the queue still ends with None
+        """
+        try:
+            if self.edgeQueue is None:
+                self.serialEdgeList = self.selectEdges()
+                return
+
+            for block in self.sampleBlocks():
+                if self.cancelled:
+                    break
+                self.edgeQueue.put(block)
+        except Exception, error:
+            self.error = error
+            raise
+        finally:
+            if self.edgeQueue is not None:
+                self.edgeQueue.put(None)
+
+    def cancel(self):
+        """ Makes a streaming thread stop after the block it is putting on ChooseEdges::edgeQueue. The queue has to
+            be emptied up to the closing None for the thread to finish
+        """
+        self.cancelled = 1
+
+    def getNoOfEdges(noOfEdges, noOfWorkers, index):
+        """ Number of edges selected by one of the workers when the edges are shared equally among them
+
+            @param noOfEdges Total number of edges
+            @param noOfWorkers Number of workers
+            @param index Index of the worker
+            @return Number of edges of the worker
+        """
+        workerEdges = noOfEdges/noOfWorkers
+        if index < noOfEdges % noOfWorkers:
+            workerEdges += 1
+        return workerEdges
 
+    getNoOfEdges = staticmethod(getNoOfEdges)
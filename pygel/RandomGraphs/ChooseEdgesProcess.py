@@ -0,0 +1,210 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+import multiprocessing, ctypes
+from multiprocessing.sharedctypes import RawArray
+import numpy
+from RMATSampler import *
+from ChooseEdges import *
+from pygel.Exceptions.Exceptions import *
+
+
+class ChooseEdgesProcess(multiprocessing.Process):
+    """ Process for selecting a set of edges. Unlike RandomGraphs::ChooseEdges it is not limited by the interpreter
+        lock. The selected edges are written to a slice of a shared memory buffer instead of being sent back to
+        the parent process.
+
+        \ingroup RandomGraphs
+
+    """
+
+    ## Number of edges sampled at once by the sampler
+    blockSize = 65536
+
+    ## Process ID
+    id = 0
+
+    def __init__(self, noOfEdges, noSelfLoops, startVertX, endVertX, startVertY, endVertY, probA, probB, probC, probD,
+                 sharedEdges, sharedCounts, index, offset, seed=None, edgeQueue=None,
+                 sampler=None, permutation=None, progress=None):
+        """ Constructs a selector process
+
+            @param sharedEdges Shared buffer of alternating start and end vertex numbers filled by all processes
+            @param sharedCounts Shared buffer with the number of edges selected by each process
+            @param index Index of this process in sharedCounts
+            @param offset Position of the first edge of this process in sharedEdges
+            @param seed Seed of the whole generation. If None, the edges are not reproducible
+            @param edgeQueue Bounded multiprocessing.Queue receiving the selected edges block by block. If given,
+                             sharedEdges and sharedCounts are not used and may be None
+            @param sampler Sampler of the edges, e.g. RandomGraphs::KroneckerSampler. If None, a RandomGraphs::RMATSampler
+                           for the adjacency matrix and quadrant probabilities is used
+            @param permutation RandomGraphs::VertexPermutation applied to the vertex numbers of every block. If None, the
+                               vertex numbers are not permuted
+            @param progress Started RandomGraphs::GenerationProgress counting the edges of every block under index.
+                            If None, progress is not reported
+            @see RandomGraphs::DirectedPowerLawRandomGraph
+        """
+        multiprocessing.Process.__init__(self)
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.startVertX = startVertX
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.endVertX = endVertX
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.startVertY = startVertY
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.endVertY = endVertY
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.noOfEdges = noOfEdges
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.probA = probA
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.probB = probB
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.probC = probC
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.probD = probD
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.noSelfLoops = noSelfLoops
+
+        ## Shared buffer of alternating start and end vertex numbers
+        self.sharedEdges = sharedEdges
+
+        ## Shared buffer with the number of edges selected by each process
+        self.sharedCounts = sharedCounts
+
+        ## Index of this process in sharedCounts
+        self.index = index
+
+        ## Position of the first edge of this process in sharedEdges
+        self.offset = offset
+
+        ## Seed of the whole generation
+        self.seed = seed
+
+        ## Queue receiving the selected edges block by block. Ends with None
+        self.edgeQueue = edgeQueue
+
+        ## Sampler of the edges. If None, a RandomGraphs::RMATSampler is used
+        self.sampler = sampler
+
+        ## Permutation of the vertex numbers. If None, the vertex numbers are not permuted
+        self.permutation = permutation
+
+        ## Progress monitor. If None, progress is not reported
+        self.progress = progress
+
+        ChooseEdgesProcess.id += 1
+
+        ## Process ID
+        self.id = ChooseEdgesProcess.id
+
+    def run(self):
+        """ Start the process
+        """
+        sampler = self.sampler
+        if sampler is None:
+            sampler = RMATSampler(self.startVertX, self.endVertX, self.startVertY, self.endVertY,
+                                  self.probA, self.probB, self.probC, self.probD)
+        randomState = RMATSampler.getRandomState(self.seed, self.index)
+        blocks = sampler.sampleBlocks(self.noOfEdges, self.noSelfLoops, randomState, ChooseEdgesProcess.blockSize,
+                                      self.permutation)
+        if self.progress is not None:
+            blocks = ChooseEdges.countBlocks(blocks, self.progress, self.index)
+
+        if self.edgeQueue is not None:
+            try:
+                for block in blocks:
+                    self.edgeQueue.put(block)
+            finally:
+                self.edgeQueue.put(None)
+            return
+
+        serialEdges = numpy.ctypeslib.as_array(self.sharedEdges)
+        position = 2*self.offset
+
+        for block in blocks:
+            serialEdges[position:position+len(block)] = block
+            position += len(block)
+
+        self.sharedCounts[self.index] = (position - 2*self.offset)/2
+
+    def chooseEdges(noOfProcesses, noOfEdges, noSelfLoops, startVertX, endVertX, startVertY, endVertY, probA, probB, probC, probD,
+                    seed=None, sampler=None, permutation=None, progress=None):
+        """ Selects edges using a number of processes. Each process gets an equal number of edges to select
+
+            @param noOfProcesses Number of processes to spawn
+            @param seed Seed of the whole generation. If None, the edges are not reproducible
+            @param sampler Sampler of the edges, e.g. RandomGraphs::KroneckerSampler. If None, a RandomGraphs::RMATSampler
+                           for the adjacency matrix and quadrant probabilities is used
+            @param permutation RandomGraphs::VertexPermutation applied to the vertex numbers of every block. If None, the
+                               vertex numbers are not permuted
+            @param progress Started RandomGraphs::GenerationProgress with one counter per process. If None, progress is
+                            not reported
+            @return serialEdgeList Numpy array of alternating start and end vertex numbers
+            @throws PackageExceptions::GenerationError
+            @see RandomGraphs::DirectedPowerLawRandomGraph
+        """
+        vertexType = numpy.ctypeslib.as_ctypes_type(RMATSampler.getVertexType(endVertX, endVertY))
+
+        sharedEdges = RawArray(vertexType, 2*noOfEdges)
+        sharedCounts = RawArray(ctypes.c_uint64, noOfProcesses)
+
+        chooserProcesses = []
+        offset = 0
+        for i in range(noOfProcesses):
+            processEdges = ChooseEdges.getNoOfEdges(noOfEdges, noOfProcesses, i)
+
+            chooser = ChooseEdgesProcess(processEdges, noSelfLoops,
+                                         startVertX, endVertX, startVertY, endVertY,
+                                         probA, probB, probC, probD,
+                                         sharedEdges, sharedCounts, i, offset, seed,
+                                         sampler=sampler, permutation=permutation, progress=progress)
+            chooserProcesses.append((chooser, offset))
+            chooser.start()
+            offset += processEdges
+
+        # All processes are joined before a failure is reported, so none is left behind
+        for chooser, offset in chooserProcesses:
+            chooser.join()
+        for chooser, offset in chooserProcesses:
+            if chooser.exitcode != 0:
+                raise GenerationError(chooser.id, ErrorMessages.workerFailed)
+
+        serialEdges = numpy.ctypeslib.as_array(sharedEdges)
+        processEdgeLists = [numpy.empty(0, dtype=serialEdges.dtype)]
+        for chooser, offset in chooserProcesses:
+            processEdgeLists.append(serialEdges[2*offset:2*(offset+sharedCounts[chooser.index])])
+
+        return numpy.concatenate(processEdgeLists)
+
+    chooseEdges = staticmethod(chooseEdges)
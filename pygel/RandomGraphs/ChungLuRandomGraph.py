@@ -0,0 +1,150 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+
+from pygel.BaseElements.Vertex import *
+from pygel.BaseElements.Edge import *
+from pygel.Graph.NumberedEdgeDirectedGraph import *
+from pygel.Exceptions.Exceptions import *
+from RMATSampler import *
+from EdgeWriter import *
+from BernoulliBlockSampler import *
+
+
+class ChungLuRandomGraph(NumberedEdgeDirectedGraph):
+
+    """ Generates a directed Chung-Lu graph with given expected degrees. The edge from u to v is present with
+        probability min(1, out(u)*in(v)/S), where S is the sum of the in-degrees, so the graph copies the degree
+        profile of another graph without copying its edges. Vertices with the same out-degree (in-degree) form one
+        row (column) bucket, and the buckets are sampled with RandomGraphs::BernoulliBlockSampler. An integer degree
+        sequence with m edges has at most sqrt(2m) distinct degrees, so generation takes time linear in the number of
+        vertices plus edges. Real expected degrees are used as they are, at the cost of more buckets
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, outDegrees, inDegrees=None, seed=None):
+        """ Constructs an empty graph
+
+            @param outDegrees Expected out-degrees. Either a sequence with the degree of every vertex, or a dictionary
+                              indexed on degree with the number of vertices of every degree, as returned by
+                              NumberedEdgeDirectedGraph::getOutDegreeDistribution
+            @param inDegrees Expected in-degrees, in the same form as outDegrees. If None, the out-degrees are used.
+                             When both are dictionaries, the vertices are numbered in the order of decreasing degree, so
+                             the vertex with the highest out-degree also gets the highest in-degree
+            @param seed Seed of the random number generator. With a seed the generated edges are reproducible
+            @throws PackageExceptions::DistError
+        """
+        NumberedEdgeDirectedGraph.__init__(self)
+
+        if inDegrees is None:
+            inDegrees = outDegrees
+
+        ## Expected out-degree of every vertex. Numpy array
+        self.outDegrees = ChungLuRandomGraph.getDegreeSequence(outDegrees)
+
+        ## Expected in-degree of every vertex. Numpy array
+        self.inDegrees = ChungLuRandomGraph.getDegreeSequence(inDegrees)
+
+        if len(self.outDegrees) != len(self.inDegrees):
+            raise DistError(ErrorMessages.degreeSequencesDiffer)
+
+        ## Number of vertices
+        self.graphSize = len(self.outDegrees)
+
+        ## Seed of the random number generator
+        self.seed = seed
+
+        ## Temporary storage of edges. Numpy array of alternating start and end vertex numbers
+        self.serialEdgeList = numpy.empty(0, dtype=RMATSampler.getVertexType(self.graphSize, self.graphSize))
+
+    def getDegreeSequence(degrees):
+        """ Turns a degree distribution into a degree sequence
+
+            @param degrees Degree sequence, or dictionary indexed on degree with the number of vertices of every degree
+            @return Numpy array with the degree of every vertex. Expected degrees need not be integers, so they are
+                    kept as floats. Distributions are expanded in the order of decreasing degree
+        """
+        if isinstance(degrees, dict):
+            degreeValues = sorted(degrees.keys(), reverse=True)
+            return numpy.repeat(numpy.array(degreeValues, dtype=numpy.float64),
+                                [degrees[degree] for degree in degreeValues])
+        return numpy.asarray(degrees, dtype=numpy.float64)
+
+    getDegreeSequence = staticmethod(getDegreeSequence)
+
+    def getBuckets(degrees):
+        """ Groups the vertices by degree
+
+            @param degrees Numpy array with the degree of every vertex
+            @return Tuple of numpy arrays: the vertices sorted by decreasing degree, the degree of every bucket and the
+                    number of vertices of every bucket
+        """
+        order = numpy.argsort(-degrees, kind='mergesort')
+        bucketDegrees, bucketSizes = numpy.unique(-degrees[order], return_counts=True)
+        return order, -bucketDegrees, bucketSizes
+
+    getBuckets = staticmethod(getBuckets)
+
+    def generate(self, noOfThreads, noSelfLoops):
+        """ Generates the graph
+
+            @param noOfThreads Ignored, the edges are drawn by the calling thread. Kept so the generator can be used in
+                               place of RandomGraphs::DirectedPowerLawRandomGraph
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting graph.
+        """
+        vertexType = RMATSampler.getVertexType(self.graphSize, self.graphSize)
+        inDegreeSum = self.inDegrees.sum()
+        if inDegreeSum == 0:
+            self.serialEdgeList = numpy.empty(0, dtype=vertexType)
+            return
+
+        rowOrder, rowDegrees, rowSizes = ChungLuRandomGraph.getBuckets(self.outDegrees)
+        columnOrder, columnDegrees, columnSizes = ChungLuRandomGraph.getBuckets(self.inDegrees)
+
+        sampler = BernoulliBlockSampler(rowSizes, columnSizes, numpy.outer(rowDegrees, columnDegrees) / float(inDegreeSum))
+        rows, columns = sampler.sample(RMATSampler.getRandomState(self.seed, 0))
+
+        serialEdgeList = numpy.empty(2*len(rows), dtype=numpy.int64)
+        serialEdgeList[0::2] = rowOrder[rows] + 1
+        serialEdgeList[1::2] = columnOrder[columns] + 1
+        if noSelfLoops:
+            serialEdgeList = serialEdgeList.reshape(-1, 2)
+            serialEdgeList = serialEdgeList[serialEdgeList[:, 0] != serialEdgeList[:, 1]].ravel()
+
+        self.serialEdgeList = serialEdgeList.astype(vertexType)
+
+    def populate(self):
+        """ Populate graph with edges generated after a call to ChungLuRandomGraph::generate
+        """
+        serialEdgeList = self.serialEdgeList
+        self.addEdges(serialEdgeList[0::2], serialEdgeList[1::2])
+
+    def writeEdges(self, fileName, format):
+        """ Write edges to file
+
+            @param fileName File name to store edges
+            @param format Format of output file. @see RandomGraphs::EdgeWriter
+        """
+        EdgeWriter.writeSerialEdges(self.serialEdgeList, fileName, format, 1)
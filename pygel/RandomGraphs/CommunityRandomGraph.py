@@ -0,0 +1,166 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+
+from pygel.BaseElements.Vertex import *
+from pygel.BaseElements.Edge import *
+from pygel.Graph.NumberedEdgeDirectedGraph import *
+from pygel.Exceptions.Exceptions import *
+from ChooseEdges import *
+from EdgeWriter import *
+from RMATSampler import *
+from BernoulliBlockSampler import *
+
+
+class CommunityRandomGraph(NumberedEdgeDirectedGraph):
+
+    """ Generates a community network from a directed stochastic block model. The vertices are split into blocks
+        (communities) of consecutive vertex numbers, and every edge from block i to block j is present with
+        probability probs[i][j]. All block pairs are sampled at once by RandomGraphs::BernoulliBlockSampler in time
+        linear in the number of block pairs plus edges. Optionally the edges inside every community are drawn by its
+        own RMAT sampler instead, which gives communities with a power law degree distribution
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, blockSizes, probs, seed=None, communityEdges=None):
+        """ Constructs an empty graph
+
+            @param blockSizes Number of vertices of every block
+            @param probs Matrix of edge probabilities given as a list of rows. Cell [i][j] is the probability of every
+                         edge from block i to block j
+            @param seed Seed of the random number generators. With a seed the generated edges are reproducible
+            @param communityEdges If given, the number of edges inside every block, drawn with RMAT. The diagonal of
+                                  probs is then not used. @see CommunityRandomGraph::setProbs
+            @throws PackageExceptions::DistError
+        """
+        NumberedEdgeDirectedGraph.__init__(self)
+
+        probs = numpy.array(probs, dtype=numpy.float64)
+        if probs.shape != (len(blockSizes), len(blockSizes)):
+            raise DistError(ErrorMessages.blockProbsShape)
+        if (probs < 0).any() or (probs > 1).any():
+            raise DistError(ErrorMessages.probOutOfRange)
+        if communityEdges is not None and len(communityEdges) != len(blockSizes):
+            raise DistError(ErrorMessages.blockProbsShape)
+
+        ## Number of vertices of every block. Numpy array
+        self.blockSizes = numpy.asarray(blockSizes, dtype=numpy.int64)
+
+        ## Matrix of edge probabilities between the blocks. Numpy array
+        self.probs = probs
+
+        ## Number of edges inside every block drawn with RMAT. None if the diagonal of probs is used
+        self.communityEdges = communityEdges
+
+        ## Number of vertices
+        self.graphSize = int(self.blockSizes.sum())
+
+        ## Seed of the random number generators. The block pairs use stream 0, community i uses stream i+1
+        self.seed = seed
+
+        ## Probabilities of the RMAT quadrants inside the communities. @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.probA = 0.45
+
+        ## Probability of choosing quadrant B
+        self.probB = 0.15
+
+        ## Probability of choosing quadrant C
+        self.probC = 0.15
+
+        ## Probability of choosing quadrant D
+        self.probD = 0.25
+
+        ## Temporary storage of edges. Numpy array of alternating start and end vertex numbers
+        self.serialEdgeList = numpy.empty(0, dtype=RMATSampler.getVertexType(self.graphSize, self.graphSize))
+
+    def setProbs(self, probA, probB, probC, probD):
+        """ Sets the probability with which quadrants are chosen by the RMAT samplers of the communities
+
+            @param probA Probability of choosing quadrant A
+            @param probB Probability of choosing quadrant B
+            @param probC Probability of choosing quadrant C
+            @param probD Probability of choosing quadrant D
+            @throws PackageExceptions::DistError
+        """
+        if abs(probA + probB + probC + probD - 1) > 1e-9:
+            raise DistError(ErrorMessages.distAddOne)
+
+        self.probA = probA
+        self.probB = probB
+        self.probC = probC
+        self.probD = probD
+        return
+
+    def generate(self, noOfThreads, noSelfLoops):
+        """ Generates the graph
+
+            @param noOfThreads Ignored. All blocks are sampled together by the calling thread. Kept for the signature
+                               of RandomGraphs::DirectedPowerLawRandomGraph::generate
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting graph.
+        """
+        vertexType = RMATSampler.getVertexType(self.graphSize, self.graphSize)
+
+        probs = self.probs
+        if self.communityEdges is not None:
+            probs = probs.copy()
+            numpy.fill_diagonal(probs, 0)
+
+        sampler = BernoulliBlockSampler(self.blockSizes, self.blockSizes, probs)
+        rows, columns = sampler.sample(RMATSampler.getRandomState(self.seed, 0))
+
+        serialEdgeList = numpy.empty(2*len(rows), dtype=numpy.int64)
+        serialEdgeList[0::2] = rows + 1
+        serialEdgeList[1::2] = columns + 1
+        if noSelfLoops:
+            serialEdgeList = serialEdgeList.reshape(-1, 2)
+            serialEdgeList = serialEdgeList[serialEdgeList[:, 0] != serialEdgeList[:, 1]].ravel()
+        edgeLists = [serialEdgeList.astype(vertexType)]
+
+        if self.communityEdges is not None:
+            firstVertex = 1
+            for i in range(len(self.blockSizes)):
+                lastVertex = firstVertex + int(self.blockSizes[i]) - 1
+                communitySampler = RMATSampler(firstVertex, lastVertex, firstVertex, lastVertex,
+                                               self.probA, self.probB, self.probC, self.probD)
+                blocks = communitySampler.sampleBlocks(self.communityEdges[i], noSelfLoops,
+                                                       RMATSampler.getRandomState(self.seed, i + 1), ChooseEdges.blockSize)
+                edgeLists.extend([block.astype(vertexType) for block in blocks])
+                firstVertex = lastVertex + 1
+
+        self.serialEdgeList = numpy.concatenate(edgeLists)
+
+    def populate(self):
+        """ Populate graph with edges generated after a call to CommunityRandomGraph::generate
+        """
+        serialEdgeList = self.serialEdgeList
+        self.addEdges(serialEdgeList[0::2], serialEdgeList[1::2])
+
+    def writeEdges(self, fileName, format):
+        """ Write edges to file
+
+            @param fileName File name to store edges
+            @param format Format of output file. @see RandomGraphs::EdgeWriter
+        """
+        EdgeWriter.writeSerialEdges(self.serialEdgeList, fileName, format, 1)
@@ -0,0 +1,112 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+
+from pygel.BaseElements.Vertex import *
+from pygel.BaseElements.Edge import *
+from pygel.Graph.NumberedEdgeUndirectedGraph import *
+from pygel.Exceptions.Exceptions import *
+from RMATSampler import *
+from EdgeWriter import *
+from ChungLuRandomGraph import *
+
+
+class ConfigurationModelRandomGraph(NumberedEdgeUndirectedGraph):
+
+    """ Generates an undirected configuration model graph with an exact degree sequence. Every vertex gets one stub
+        per unit of degree, and the stubs are paired by a single shuffle of the stub array. The result may contain
+        self loops and multi-edges, which can be removed with a sort over the edge keys
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, degrees, seed=None):
+        """ Constructs an empty graph
+
+            @param degrees Degree sequence, or dictionary indexed on degree with the number of vertices of every degree,
+                           as returned by NumberedEdgeUndirectedGraph::getDegreeDistribution. The degrees must be
+                           integers adding to an even number
+            @param seed Seed of the random number generator. With a seed the generated edges are reproducible
+            @throws PackageExceptions::DistError
+        """
+        NumberedEdgeUndirectedGraph.__init__(self)
+
+        # Every degree is a number of stubs, so unlike the expected degrees of Chung-Lu it must be a whole number
+        degrees = ChungLuRandomGraph.getDegreeSequence(degrees)
+        if (degrees != numpy.floor(degrees)).any():
+            raise DistError(ErrorMessages.degreesNotIntegers)
+
+        ## Degree of every vertex. Numpy array
+        self.degrees = degrees.astype(numpy.int64)
+
+        if self.degrees.sum() % 2 != 0:
+            raise DistError(ErrorMessages.oddDegreeSum)
+
+        ## Number of vertices
+        self.graphSize = len(self.degrees)
+
+        ## Seed of the random number generator
+        self.seed = seed
+
+        ## Temporary storage of edges. Numpy array of alternating start and end vertex numbers
+        self.serialEdgeList = numpy.empty(0, dtype=RMATSampler.getVertexType(self.graphSize, self.graphSize))
+
+    def generate(self, noOfThreads, noSelfLoops, noMultiEdges=0):
+        """ Generates the graph. Without cleanup every vertex has exactly its degree, counting a self loop twice
+
+            @param noOfThreads Ignored, as the stubs are paired by a single shuffle. Kept for the signature of
+                               RandomGraphs::UndirectedPowerLawRandomGraph::generate
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting graph.
+            @param noMultiEdges If true (set to 1) only the first of the edges between a pair of vertices is kept
+        """
+        vertexType = RMATSampler.getVertexType(self.graphSize, self.graphSize)
+
+        stubs = numpy.repeat(numpy.arange(1, self.graphSize + 1, dtype=vertexType), self.degrees)
+        RMATSampler.getRandomState(self.seed, 0).shuffle(stubs)
+
+        # Consecutive stubs of the shuffled array form the edges
+        serialEdgeList = stubs
+        if noSelfLoops:
+            serialEdgeList = serialEdgeList.reshape(-1, 2)
+            serialEdgeList = serialEdgeList[serialEdgeList[:, 0] != serialEdgeList[:, 1]].ravel()
+        if noMultiEdges:
+            serialEdgeList = NumberedEdgeUndirectedGraph.getUniqueEdges(serialEdgeList, self.graphSize)
+
+        self.serialEdgeList = serialEdgeList
+
+    def populate(self):
+        """ Populate graph with edges generated after a call to ConfigurationModelRandomGraph::generate. Self loops
+            and multi-edges that were not removed by ConfigurationModelRandomGraph::generate are logged and skipped
+            by Graph::NumberedEdgeUndirectedGraph::addEdges
+        """
+        serialEdgeList = self.serialEdgeList
+        self.addEdges(serialEdgeList[0::2], serialEdgeList[1::2])
+
+    def writeEdges(self, fileName, format):
+        """ Write edges to file
+
+            @param fileName File name to store edges
+            @param format Format of output file. @see RandomGraphs::EdgeWriter
+        """
+        EdgeWriter.writeSerialEdges(self.serialEdgeList, fileName, format, 0)
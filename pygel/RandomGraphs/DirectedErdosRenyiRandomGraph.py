@@ -0,0 +1,108 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+
+from pygel.BaseElements.Vertex import *
+from pygel.BaseElements.Edge import *
+from pygel.Graph.NumberedEdgeDirectedGraph import *
+from pygel.Exceptions.Exceptions import *
+from ChooseEdges import *
+from EdgeWriter import *
+from ErdosRenyiSampler import *
+
+
+class DirectedErdosRenyiRandomGraph(NumberedEdgeDirectedGraph):
+
+    """ Generates a directed Erdos-Renyi random graph, either G(n,p), where every possible edge is present with
+        probability p, or G(n,m), where m distinct edges are chosen uniformly. Takes time linear in the number of
+        vertices plus edges. @see RandomGraphs::ErdosRenyiSampler
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, size, noOfEdges=None, prob=None, seed=None):
+        """ Constructs an empty graph. Exactly one of noOfEdges and prob must be given
+
+            @param size Number of vertices to be considered for generation
+            @param noOfEdges Number of edges of a G(n,m) graph
+            @param prob Probability of every edge of a G(n,p) graph
+            @param seed Seed of the random number generator. With a seed the generated edges are reproducible
+            @throws PackageExceptions::DistError
+        """
+        NumberedEdgeDirectedGraph.__init__(self)
+
+        if (noOfEdges is None) == (prob is None):
+            raise DistError(ErrorMessages.edgesOrProb)
+        if prob is not None and (prob < 0 or prob > 1):
+            raise DistError(ErrorMessages.probOutOfRange)
+
+        ## Number of vertices to be considered for generation
+        self.graphSize = size
+
+        ## Number of edges of a G(n,m) graph. None for a G(n,p) graph
+        self.noOfEdges = noOfEdges
+
+        ## Probability of every edge of a G(n,p) graph. None for a G(n,m) graph
+        self.prob = prob
+
+        ## Seed of the random number generator
+        self.seed = seed
+
+        ## Temporary storage of edges. Numpy array of alternating start and end vertex numbers
+        self.serialEdgeList = numpy.empty(0, dtype=RMATSampler.getVertexType(size, size))
+
+    def generate(self, noOfThreads, noSelfLoops):
+        """ Generates the graph. Takes the arguments of RandomGraphs::DirectedPowerLawRandomGraph::generate, so the
+            generators can be used in place of each other
+
+            @param noOfThreads Ignored. The sampler draws all edges in the calling thread
+            @param noSelfLoops If true (set to 1) self loops are not possible edges
+            @throws PackageExceptions::DistError
+        """
+        sampler = ErdosRenyiSampler(self.graphSize, 1, noSelfLoops)
+        randomState = RMATSampler.getRandomState(self.seed, 0)
+        vertexType = RMATSampler.getVertexType(self.graphSize, self.graphSize)
+
+        if self.prob is None:
+            if self.noOfEdges > sampler.noOfPairs:
+                raise DistError(ErrorMessages.tooManyUniqueEdges)
+            self.serialEdgeList = sampler.sampleCount(self.noOfEdges, randomState).astype(vertexType)
+            return
+
+        blocks = [block.astype(vertexType) for block in sampler.sampleProbBlocks(self.prob, randomState, ChooseEdges.blockSize)]
+        self.serialEdgeList = numpy.concatenate([numpy.empty(0, dtype=vertexType)] + blocks)
+
+    def populate(self):
+        """ Populate graph with edges generated after a call to DirectedErdosRenyiRandomGraph::generate
+        """
+        serialEdgeList = self.serialEdgeList
+        self.addEdges(serialEdgeList[0::2], serialEdgeList[1::2])
+
+    def writeEdges(self, fileName, format):
+        """ Write edges to file
+
+            @param fileName File name to store edges
+            @param format Format of output file. @see RandomGraphs::EdgeWriter
+        """
+        EdgeWriter.writeSerialEdges(self.serialEdgeList, fileName, format, 1)
@@ -22,12 +22,21 @@
 #
 
 import random
+import numpy
 
 from pygel.BaseElements.Vertex import *
 from pygel.BaseElements.Edge import *
 from pygel.Graph.NumberedEdgeDirectedGraph import *
 from pygel.Exceptions.Exceptions import *
 from ChooseEdges import *
+from ChooseEdgesProcess import *
+from EdgeStream import *
+from EdgeWriter import *
+from VertexPermutation import *
+from GenerationProgress import *
+from GenerationEngine import *
+from InfiniteEdgeStream import *
+from RMATFitter import *
 
 class DirectedPowerLawRandomGraph(NumberedEdgeDirectedGraph):
 
@@ -35,11 +44,14 @@ class DirectedPowerLawRandomGraph(NumberedEdgeDirectedGraph):
         \ingroup RandomGraphs
     """
 
-    def __init__(self, size, noOfEdges):
+    def __init__(self, size, noOfEdges, seed=None, permutationKey=None):
         """ Constructs an empty graph
 
             @param size Number of vertices to be considered for generation
             @param noOfEdges Number of edges to generate
+            @param seed Seed of the random number generators. With a seed the generated edges are reproducible
+            @param permutationKey If given, the vertex numbers are scrambled by a RandomGraphs::VertexPermutation with
+                                  this key. Otherwise the hubs get the lowest vertex numbers
         """
         NumberedEdgeDirectedGraph.__init__(self)
 
@@ -50,6 +62,21 @@ class DirectedPowerLawRandomGraph(NumberedEdgeDirectedGraph):
         ## Number of edges to generate
         self.noOfEdges = noOfEdges
 
+        ## Seed of the random number generators. Each worker derives its own independent stream from it
+        self.seed = seed
+
+        ## Permutation scrambling the vertex numbers. If None, the vertex numbers are not permuted
+        self.permutation = None
+        if permutationKey is not None:
+            self.permutation = VertexPermutation(size, permutationKey)
+
+        ## RandomGraphs::GenerationProgress reporting the progress of generate and generateToFile. If None, progress is
+        ## not reported
+        self.progress = None
+
+        ## Sampler of the edges. If None, the workers use a RandomGraphs::RMATSampler for probA..probD
+        self.sampler = None
+
         ## Parameters of the RMAT algorithm. Decide the probability with which quadrants in an adjacency matrix are chosen
         ## \todo Add description about choosing these probabilities
 
@@ -66,8 +93,9 @@ class DirectedPowerLawRandomGraph(NumberedEdgeDirectedGraph):
         ## Probability of choosing quadrant D
         self.probD = 0.25
 
-        ## Temporary storage of edges. Maintained for achieving performance
-        self.serialEdgeList = []
+        ## Temporary storage of edges. Maintained for achieving performance. Numpy array of alternating start and end
+        ## vertex numbers, typed by RandomGraphs::RMATSampler::getVertexType
+        self.serialEdgeList = numpy.empty(0, dtype=RMATSampler.getVertexType(size, size))
 
         ## Debug flag
         self.debug = 0
@@ -87,7 +115,7 @@ class DirectedPowerLawRandomGraph(NumberedEdgeDirectedGraph):
             @param probD Probability of choosing quadrant D
             @throws PackageExceptions::DistError
         """
-        if probA + probB + probC + probD != 1:
+        if abs(probA + probB + probC + probD - 1) > 1e-9:
             raise DistError(ErrorMessages.distAddOne)
         
         self.probA = probA
@@ -96,41 +124,216 @@ class DirectedPowerLawRandomGraph(NumberedEdgeDirectedGraph):
         self.probD = probD
         return
 
-    def generate(self, noOfThreads, noSelfLoops):
+    def fitProbs(self, outDegreeDistribution, inDegreeDistribution):
+        """ Sets the quadrant probabilities that fit target degree distributions best, e.g. those of a crawl. No graph
+            is generated for the fit. The odds ratio probA*probD/(probB*probC) of the current probabilities is kept.
+            @see RandomGraphs::RMATFitter
+
+            @param outDegreeDistribution Dictionary indexed on out-degree. Values are the number of nodes for an out-degree
+            @param inDegreeDistribution Dictionary indexed on in-degree. Values are the number of nodes for an in-degree
+            @return Tuple of the fitted probA, probB, probC and probD
+            @throws PackageExceptions::DistError
+        """
+        oddsRatio = 1.0
+        if self.probB * self.probC > 0 and self.probA * self.probD > 0:
+            oddsRatio = self.probA * self.probD / (self.probB * self.probC)
+
+        probs = RMATFitter(self.graphSize, self.noOfEdges).fit(outDegreeDistribution, inDegreeDistribution, oddsRatio)
+        self.setProbs(*probs)
+        return probs
+
+    def generate(self, noOfThreads, noSelfLoops, workerType='thread'):
         """ Generates a the graph. Heart of web graph generation algorithm. Each thread gets an equal number of nodes to generate.
 
-            @param noOfThreads Number of threads to spawn for the graph generation. More threads does not correspond to fast generation  
-            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting graph.   
+            @param noOfThreads Number of threads (or processes) to spawn for the graph generation. More threads does not correspond to fast generation, more processes do
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting graph.
+            @param workerType Kind of workers used for the generation. Can take values: <br>
+                              'thread' = RandomGraphs::ChooseEdges threads <br>
+                              'process' = RandomGraphs::ChooseEdgesProcess processes
+            @throws PackageExceptions::GenerationError
         """
+        self.startProgress(noOfThreads)
+        if workerType == 'process':
+            try:
+                self.serialEdgeList = ChooseEdgesProcess.chooseEdges(noOfThreads, self.noOfEdges, noSelfLoops,
+                                                                     self.startVertX, self.endVertX, self.startVertY, self.endVertY,
+                                                                     self.probA, self.probB, self.probC, self.probD,
+                                                                     self.seed, self.sampler, self.permutation, self.progress)
+            finally:
+                self.stopProgress()
+            return
+
         chooserThreads = []
         for i in range(noOfThreads):
-            chooser = ChooseEdges(self.noOfEdges/noOfThreads, noSelfLoops,
+            chooser = ChooseEdges(ChooseEdges.getNoOfEdges(self.noOfEdges, noOfThreads, i), noSelfLoops,
                                   self.startVertX, self.endVertX, self.startVertY, self.endVertY,
-                                  self.probA, self.probB, self.probC, self.probD)
+                                  self.probA, self.probB, self.probC, self.probD,
+                                  self.seed, i, sampler=self.sampler, permutation=self.permutation,
+                                  progress=self.progress)
             
             chooserThreads.append(chooser)
             chooser.start()
 
         for t in chooserThreads:
             t.join()
-        
-        self.serialEdgeList = ChooseEdges.serialEdgeList
+        self.stopProgress()
+
+        for t in chooserThreads:
+            if t.error is not None:
+                raise GenerationError(t.id, ErrorMessages.workerFailed)
+
+        # The empty array keeps the vertex type when there are no threads
+        vertexType = RMATSampler.getVertexType(self.endVertX, self.endVertY)
+        self.serialEdgeList = numpy.concatenate([numpy.empty(0, dtype=vertexType)] +
+                                                [t.serialEdgeList for t in chooserThreads])
 
         del chooserThreads
-        del ChooseEdges.serialEdgeList
         return
 
+    def generateWithEngine(self, engine, noSelfLoops):
+        """ Generates the graph with a RandomGraphs::GenerationEngine, whose workers take chunks of edges from a work
+            queue. Unlike DirectedPowerLawRandomGraph::generate, a seeded graph does not depend on the number of workers
+
+            @param engine RandomGraphs::GenerationEngine running the generation. It may be shared with other graphs
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting graph.
+            @throws PackageExceptions::GenerationError
+        """
+        self.finishGeneration(self.startGeneration(engine, noSelfLoops))
+
+    def startGeneration(self, engine, noSelfLoops):
+        """ Starts generating the graph with a RandomGraphs::GenerationEngine and returns without waiting, so the caller
+            is not blocked. The chunks can be taken as they finish from the returned run, and
+            DirectedPowerLawRandomGraph::finishGeneration stores the edges in the graph
+
+            @param engine RandomGraphs::GenerationEngine running the generation. It may be shared with other graphs
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting graph.
+            @return RandomGraphs::GenerationRun of the generation
+        """
+        sampler = self.sampler
+        if sampler is None:
+            sampler = RMATSampler(self.startVertX, self.endVertX, self.startVertY, self.endVertY,
+                                  self.probA, self.probB, self.probC, self.probD)
+
+        if self.progress is not None:
+            self.progress.start(engine.getChunkSizes(self.noOfEdges), 'chunk')
+        return engine.start(self.noOfEdges, noSelfLoops, sampler, max(self.endVertX, self.endVertY), self.seed,
+                            self.permutation, self.progress)
+
+    def finishGeneration(self, run):
+        """ Waits for a generation started with DirectedPowerLawRandomGraph::startGeneration and keeps its edges
+
+            @param run RandomGraphs::GenerationRun of the generation
+            @throws PackageExceptions::GenerationError
+        """
+        try:
+            self.serialEdgeList = run.getResult()
+        finally:
+            self.stopProgress()
+
+    def streamBatches(self, noSelfLoops, batchSize=ChooseEdges.blockSize, rate=None, timeStep=None, startTime=0.0):
+        """ Streams edges of the graph in batches without end and without building the graph. The number of edges of
+            the graph is ignored. @see RandomGraphs::InfiniteEdgeStream
+
+            @param noSelfLoops If true (set to 1) self loops are discarded from the batches
+            @param batchSize Number of edges drawn for every batch
+            @param rate Maximum number of edges per second. If None, the stream is not paced
+            @param timeStep If given, every batch comes with synthetic timestamps timeStep apart
+            @param startTime Timestamp of the first edge
+            @return RandomGraphs::InfiniteEdgeStream
+            @throws PackageExceptions::DistError
+        """
+        sampler = self.sampler
+        if sampler is None:
+            sampler = RMATSampler(self.startVertX, self.endVertX, self.startVertY, self.endVertY,
+                                  self.probA, self.probB, self.probC, self.probD)
+        return InfiniteEdgeStream(sampler, noSelfLoops, batchSize, self.seed, self.permutation, rate, timeStep,
+                                  startTime)
+
+    def generateShard(self, shardIndex, noOfShards, noSelfLoops):
+        """ Regenerates the edges of a single worker of a seeded generation without running the other workers. The
+            result is the same for threads and processes
+
+            @param shardIndex Index of the worker whose edges are generated
+            @param noOfShards Number of workers of the whole generation
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting edges.
+            @return serialEdgeList Numpy array of alternating start and end vertex numbers
+        """
+        chooser = ChooseEdges(ChooseEdges.getNoOfEdges(self.noOfEdges, noOfShards, shardIndex), noSelfLoops,
+                              self.startVertX, self.endVertX, self.startVertY, self.endVertY,
+                              self.probA, self.probB, self.probC, self.probD,
+                              self.seed, shardIndex, sampler=self.sampler, permutation=self.permutation)
+        return chooser.selectEdges()
+
+    def generateShardToFile(self, shardIndex, noOfShards, noSelfLoops, fileName, format):
+        """ Regenerates the edges of a single worker like DirectedPowerLawRandomGraph::generateShard and writes them straight to a
+            file. Used for spreading one graph over several machines. Concatenating the files of all shards in order
+            gives the edges of DirectedPowerLawRandomGraph::generate with noOfShards workers and the same seed
+
+            @param shardIndex Index of the worker whose edges are generated
+            @param noOfShards Number of workers of the whole generation
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting edges.
+            @param fileName File name to store edges
+            @param format Format of output file. @see DirectedPowerLawRandomGraph::writeEdges
+            @return Number of edges written
+        """
+        chooser = ChooseEdges(ChooseEdges.getNoOfEdges(self.noOfEdges, noOfShards, shardIndex), noSelfLoops,
+                              self.startVertX, self.endVertX, self.startVertY, self.endVertY,
+                              self.probA, self.probB, self.probC, self.probD,
+                              self.seed, shardIndex, sampler=self.sampler, permutation=self.permutation)
+
+        edgeWriter = EdgeWriter(fileName, format, 1)
+        try:
+            for block in chooser.sampleBlocks():
+                edgeWriter.write(block)
+        finally:
+            edgeWriter.close()
+        return edgeWriter.noOfEdges
+
+    def generateToFile(self, noOfThreads, noSelfLoops, fileName, format, workerType='thread'):
+        """ Generates the graph and writes its edges straight to a file. Unlike DirectedPowerLawRandomGraph::generate the
+            edges are not kept in serialEdgeList, so the memory used does not grow with the number of edges. The graph
+            cannot be populated afterwards
+
+            @param noOfThreads Number of threads (or processes) to spawn for the graph generation
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting graph.
+            @param fileName File name to store edges
+            @param format Format of output file. @see DirectedPowerLawRandomGraph::writeEdges
+            @param workerType Kind of workers used for the generation. @see DirectedPowerLawRandomGraph::generate
+            @return Number of edges written
+        """
+        edgeWriter = EdgeWriter(fileName, format, 1)
+        self.startProgress(noOfThreads)
+        try:
+            EdgeStream.streamEdges(noOfThreads, workerType, self.noOfEdges, noSelfLoops,
+                                   self.startVertX, self.endVertX, self.startVertY, self.endVertY,
+                                   self.probA, self.probB, self.probC, self.probD,
+                                   self.seed, edgeWriter, self.sampler, self.permutation, self.progress)
+        finally:
+            self.stopProgress()
+            edgeWriter.close()
+        return edgeWriter.noOfEdges
+
+    def startProgress(self, noOfThreads):
+        """ Starts DirectedPowerLawRandomGraph::progress, if set, for the workers of a generation
+
+            @param noOfThreads Number of workers of the generation
+        """
+        if self.progress is not None:
+            self.progress.start([ChooseEdges.getNoOfEdges(self.noOfEdges, noOfThreads, i) for i in range(noOfThreads)])
+
+    def stopProgress(self):
+        """ Stops DirectedPowerLawRandomGraph::progress, if set, and reports the final state
+        """
+        if self.progress is not None:
+            self.progress.stop()
+
     def populate(self):
         """ Populate graph with edges generated after a call to DirectedPowerLawRandomGraph::generate. You should call this method before you can use any of the non-overridden method in Graph::NumberedEdgeDirectedGraph
         
         """
         serialEdgeList = self.serialEdgeList
+        self.addEdges(serialEdgeList[0::2], serialEdgeList[1::2])
 
-        for i in xrange(0,len(serialEdgeList)-1,2):
-            newEdge = Edge(Vertex(serialEdgeList[i]), Vertex(serialEdgeList[i+1]))
-            self.addEdge(newEdge)
-
-        
     def writeEdges(self, fileName, format):
         """ Write edges to file
 
@@ -141,26 +344,4 @@ class DirectedPowerLawRandomGraph(NumberedEdgeDirectedGraph):
                           'csv' = comma separated value format
                           
         """
-        serialEdgeList = self.serialEdgeList
-
-        if format == 'simple':
-            f = open(fileName,'w')
-            for i in xrange(0,len(serialEdgeList)-1,2):
-                f.write("%s -> %s\n" % (serialEdgeList[i], serialEdgeList[i+1]))
-            f.close()
-            
-        elif format == 'dot':
-            f = open(fileName,'w')
-            f.write("digraph G { \n")
-            for i in xrange(0,len(serialEdgeList)-1,2):
-                f.write("%s -> %s\n" % (serialEdgeList[i], serialEdgeList[i+1]))
-            f.write("} \n")
-            f.close()
-
-        if format == 'csv':
-            f = open(fileName,'w')
-            for i in xrange(0,len(serialEdgeList)-1,2):
-                f.write("%s,%s\n" % (serialEdgeList[i], serialEdgeList[i+1]))
-            f.close()
-
-
+        EdgeWriter.writeSerialEdges(self.serialEdgeList, fileName, format, 1)
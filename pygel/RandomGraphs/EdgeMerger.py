@@ -0,0 +1,118 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import heapq, itertools
+from ChooseEdges import *
+from EdgeWriter import *
+from pygel.Exceptions.Exceptions import *
+
+
+class EdgeMerger:
+    """ Merges edge files written by RandomGraphs::EdgeWriter, for example the shards written by
+        DirectedPowerLawRandomGraph::generateShardToFile, into a single file
+
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, format, directed):
+        """ Constructs a merger for files of one format
+
+            @param format Format of the input and output files. @see RandomGraphs::EdgeWriter
+            @param directed If true (set to 1) the files hold directed edges
+            @throws PackageExceptions::FormatError
+        """
+        if format not in EdgeWriter.formats:
+            raise FormatError(format, ErrorMessages.unknownFormat)
+
+        ## Format of the input and output files
+        self.format = format
+
+        ## If true (set to 1) the files hold directed edges
+        self.directed = directed
+
+        if format == 'csv':
+            ## Separator between the start and end vertex numbers of an edge
+            self.separator = ','
+        elif directed:
+            self.separator = '->'
+        else:
+            self.separator = '--'
+
+    def readEdges(self, fileName):
+        """ Reads the edges of a file one by one. Header and footer lines of the 'dot' format are skipped
+
+            @param fileName File name to read edges from
+            @return Iterator over tuples of start and end vertex numbers
+        """
+        separator = self.separator
+        f = open(fileName)
+        for line in f:
+            if separator not in line:
+                continue
+            startVertex, endVertex = line.split(separator)
+            yield (int(startVertex), int(endVertex))
+        f.close()
+
+    def readSortedEdges(self, fileName):
+        """ Reads the edges of a file one by one and checks that they are sorted by start and end vertex number, as
+            heapq.merge takes the order of its inputs for granted
+
+            @param fileName File name to read edges from
+            @return Iterator over tuples of start and end vertex numbers
+            @throws PackageExceptions::EdgeError
+        """
+        previousEdge = None
+        for edge in self.readEdges(fileName):
+            if previousEdge is not None and edge < previousEdge:
+                raise EdgeError(edge[0], edge[1], ErrorMessages.edgesNotSorted)
+            previousEdge = edge
+            yield edge
+
+    def merge(self, fileNames, outputFileName, sortedMerge=0):
+        """ Merges edge files
+
+            @param fileNames List of file names to merge
+            @param outputFileName File name to store the merged edges
+            @param sortedMerge If true (set to 1) the files, each sorted by start and end vertex number, are k-way
+                               merged into one sorted file. Otherwise they are concatenated in the given order
+            @return Number of edges written
+            @throws PackageExceptions::EdgeError
+        """
+        if sortedMerge:
+            edges = heapq.merge(*[self.readSortedEdges(fileName) for fileName in fileNames])
+        else:
+            edges = itertools.chain(*[self.readEdges(fileName) for fileName in fileNames])
+
+        edgeWriter = EdgeWriter(outputFileName, self.format, self.directed)
+        try:
+            block = []
+            for edge in edges:
+                block.extend(edge)
+                if len(block) >= 2*ChooseEdges.blockSize:
+                    edgeWriter.write(block)
+                    block = []
+            edgeWriter.write(block)
+        finally:
+            edgeWriter.close()
+        return edgeWriter.noOfEdges
@@ -0,0 +1,132 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import sys, Queue, multiprocessing
+from ChooseEdges import *
+from ChooseEdgesProcess import *
+from pygel.Exceptions.Exceptions import *
+
+
+class EdgeStream:
+    """ Streaming generation of edges. Each worker puts its edges block by block on its own bounded queue, and the
+        calling thread takes one block of every worker in turn and hands it to a RandomGraphs::EdgeWriter. At most
+        EdgeStream::queueSize blocks per worker are held in memory, whatever the number of edges. The order of the
+        blocks only depends on the number of workers, so seeded streams are reproducible
+
+        \ingroup RandomGraphs
+    """
+
+    ## Maximum number of blocks waiting in the queue of a worker
+    queueSize = 4
+
+    def streamEdges(noOfWorkers, workerType, noOfEdges, noSelfLoops, startVertX, endVertX, startVertY, endVertY,
+                    probA, probB, probC, probD, seed, edgeWriter, sampler=None,
+                    permutation=None, progress=None):
+        """ Generates edges and writes them with an edge writer
+
+            @param noOfWorkers Number of threads or processes to spawn
+            @param workerType Kind of workers used for the generation. Can take values: <br>
+                              'thread' = RandomGraphs::ChooseEdges threads <br>
+                              'process' = RandomGraphs::ChooseEdgesProcess processes
+            @param seed Seed of the whole generation. If None, the edges are not reproducible
+            @param edgeWriter RandomGraphs::EdgeWriter the edges are written to
+            @param sampler Sampler of the edges, e.g. RandomGraphs::KroneckerSampler. If None, a RandomGraphs::RMATSampler
+                           for the adjacency matrix and quadrant probabilities is used
+            @param permutation RandomGraphs::VertexPermutation applied to the vertex numbers of every block. If None, the
+                               vertex numbers are not permuted
+            @param progress Started RandomGraphs::GenerationProgress with one counter per worker. If None, progress is
+                            not reported
+            @throws PackageExceptions::GenerationError
+            @see RandomGraphs::DirectedPowerLawRandomGraph
+        """
+        workers = []
+        queues = []
+        for i in range(noOfWorkers):
+            workerEdges = ChooseEdges.getNoOfEdges(noOfEdges, noOfWorkers, i)
+            if workerType == 'process':
+                edgeQueue = multiprocessing.Queue(EdgeStream.queueSize)
+                worker = ChooseEdgesProcess(workerEdges, noSelfLoops,
+                                            startVertX, endVertX, startVertY, endVertY,
+                                            probA, probB, probC, probD,
+                                            None, None, i, 0, seed, edgeQueue, sampler, permutation, progress)
+            else:
+                edgeQueue = Queue.Queue(EdgeStream.queueSize)
+                worker = ChooseEdges(workerEdges, noSelfLoops,
+                                     startVertX, endVertX, startVertY, endVertY,
+                                     probA, probB, probC, probD,
+                                     seed, i, edgeQueue, sampler, permutation, progress)
+            workers.append(worker)
+            queues.append(edgeQueue)
+            worker.start()
+
+        # Queues are taken out of the rotation once they have delivered their closing None
+        running = [1] * noOfWorkers
+        try:
+            activeWorkers = range(noOfWorkers)
+            while activeWorkers:
+                remainingWorkers = []
+                for i in activeWorkers:
+                    block = queues[i].get()
+                    if block is None:
+                        running[i] = 0
+                        continue
+                    edgeWriter.write(block)
+                    remainingWorkers.append(i)
+                activeWorkers = remainingWorkers
+        except:
+            error = sys.exc_info()
+            EdgeStream.stopWorkers(workerType, workers, queues, running)
+            raise error[0], error[1], error[2]
+
+        for worker in workers:
+            worker.join()
+        for worker in workers:
+            if workerType == 'process':
+                failed = worker.exitcode != 0
+            else:
+                failed = worker.error is not None
+            if failed:
+                raise GenerationError(worker.id, ErrorMessages.workerFailed)
+
+    streamEdges = staticmethod(streamEdges)
+
+    def stopWorkers(workerType, workers, queues, running):
+        """ Stops the workers of a stream that is given up, e.g. because the edge writer failed. Processes are
+            terminated. Threads cannot be, so they are cancelled and their queues are emptied until they end
+
+            @param workerType Kind of the workers, 'thread' or 'process'
+            @param workers Workers of the stream
+            @param queues Queues of the workers
+            @param running Flags of the workers whose queues have not delivered their closing None yet
+        """
+        for worker, edgeQueue, isRunning in zip(workers, queues, running):
+            if workerType == 'process':
+                worker.terminate()
+            else:
+                worker.cancel()
+                while isRunning and edgeQueue.get() is not None:
+                    pass
+            worker.join()
+
+    stopWorkers = staticmethod(stopWorkers)
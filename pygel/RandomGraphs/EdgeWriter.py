@@ -0,0 +1,118 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+from pygel.Exceptions.Exceptions import *
+
+
+class EdgeWriter:
+    """ Formats blocks of a serial edge list and writes them to a file. Used for writing edges while they are
+        generated, without keeping them in memory. The output is the same as the one of
+        DirectedPowerLawRandomGraph::writeEdges and UndirectedPowerLawRandomGraph::writeEdges
+
+        \ingroup RandomGraphs
+    """
+
+    ## Number of edges formatted at once by EdgeWriter::writeSerialEdges
+    blockSize = 65536
+
+    ## Formats that can be written
+    formats = ['simple', 'dot', 'csv']
+
+    def __init__(self, fileName, format, directed):
+        """ Opens the file and writes the header of the format
+
+            @param fileName File name to store edges
+            @param format Format of output file. Can take values: <br>
+                          'simple' = simple format <br>
+                          'dot' = format compatible with 'dot' command
+                          'csv' = comma separated value format
+            @param directed If true (set to 1) edges are written as directed edges
+            @throws PackageExceptions::FormatError
+        """
+        if format not in EdgeWriter.formats:
+            raise FormatError(format, ErrorMessages.unknownFormat)
+
+        if directed:
+            separator = '->'
+            graphType = 'digraph'
+        else:
+            separator = '--'
+            graphType = 'graph'
+
+        lineFormats = {'simple': "%%s %s %%s\n" % (separator),
+                       'dot': "%%s %s %%s\n" % (separator),
+                       'csv': "%s,%s\n"}
+
+        ## Format of a single edge line
+        self.lineFormat = lineFormats[format]
+
+        ## Text written after the last edge
+        self.footer = ''
+
+        ## Number of edges written
+        self.noOfEdges = 0
+
+        ## Output file
+        self.file = open(fileName, 'w')
+
+        if format == 'dot':
+            self.file.write("%s G { \n" % (graphType))
+            self.footer = "} \n"
+
+    def write(self, serialEdges):
+        """ Writes a block of edges
+
+            @param serialEdges Numpy array or list of alternating start and end vertex numbers
+        """
+        if hasattr(serialEdges, 'tolist'):
+            serialEdges = serialEdges.tolist()
+
+        noOfEdges = len(serialEdges)/2
+        self.file.write((self.lineFormat * noOfEdges) % tuple(serialEdges))
+        self.noOfEdges += noOfEdges
+
+    def close(self):
+        """ Writes the footer of the format and closes the file
+        """
+        self.file.write(self.footer)
+        self.file.close()
+
+    def writeSerialEdges(serialEdgeList, fileName, format, directed):
+        """ Writes a whole serial edge list to a file block by block. Used by the writeEdges methods of the generated
+            graphs
+
+            @param serialEdgeList Numpy array of alternating start and end vertex numbers
+            @param fileName File name to store edges
+            @param format Format of output file. @see EdgeWriter::__init__
+            @param directed If true (set to 1) edges are written as directed edges
+            @throws PackageExceptions::FormatError
+        """
+        blockLength = 2*EdgeWriter.blockSize
+
+        edgeWriter = EdgeWriter(fileName, format, directed)
+        for blockStart in xrange(0,len(serialEdgeList),blockLength):
+            edgeWriter.write(serialEdgeList[blockStart:blockStart+blockLength])
+        edgeWriter.close()
+
+    writeSerialEdges = staticmethod(writeSerialEdges)
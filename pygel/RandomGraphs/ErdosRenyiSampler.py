@@ -0,0 +1,152 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+#
+#
+
+import numpy
+
+
+class ErdosRenyiSampler:
+    """ Vectorized sampler for Erdos-Renyi random graphs. The possible edges are numbered from 0 to noOfPairs-1, and
+        only the numbers of the chosen edges are drawn: G(n,p) skips over the edges that are left out with geometric
+        jumps as in Batagelj and Brandes, "Efficient generation of large random networks" (2005), and G(n,m) draws
+        distinct numbers directly. Both take time linear in the number of vertices plus edges
+
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, size, directed, noSelfLoops):
+        """ Constructs a sampler
+
+            @param size Number of vertices, numbered from 1 to size
+            @param directed If true (set to 1) (u,v) and (v,u) are different edges. Otherwise the start vertex of an edge
+                            is never greater than its end vertex
+            @param noSelfLoops If true (set to 1) self loops are not possible edges
+        """
+        ## Number of vertices
+        self.size = size
+
+        ## If true (set to 1) (u,v) and (v,u) are different edges
+        self.directed = directed
+
+        ## If true (set to 1) self loops are not possible edges
+        self.noSelfLoops = noSelfLoops
+
+        if directed and noSelfLoops:
+            ## Number of possible edges
+            self.noOfPairs = size * (size - 1)
+        elif directed:
+            self.noOfPairs = size * size
+        elif noSelfLoops:
+            self.noOfPairs = size * (size - 1) / 2
+        else:
+            self.noOfPairs = size * (size + 1) / 2
+
+    def getEdges(self, pairs):
+        """ Turns numbers of possible edges into edges
+
+            @param pairs Numpy array of numbers of possible edges
+            @return Numpy array of alternating start and end vertex numbers
+        """
+        pairs = pairs.astype(numpy.int64)
+        size = self.size
+
+        if self.directed:
+            if self.noSelfLoops:
+                startVertices = pairs // (size - 1)
+                endVertices = pairs % (size - 1)
+                endVertices += endVertices >= startVertices
+            else:
+                startVertices = pairs // size
+                endVertices = pairs % size
+        else:
+            # Row v of the lower triangle starts at edge number v(v-1)/2 (v(v+1)/2 with self loops). The row found
+            # with floating point is corrected by one where it is off due to rounding
+            shift = 0
+            if self.noSelfLoops:
+                shift = 1
+            endVertices = ((numpy.sqrt(8.0 * pairs + 1) - 1) / 2).astype(numpy.int64) + shift
+            endVertices -= (endVertices * (endVertices + 1 - 2*shift) / 2) > pairs
+            endVertices += ((endVertices + 1) * (endVertices + 2 - 2*shift) / 2) <= pairs
+            startVertices = pairs - endVertices * (endVertices + 1 - 2*shift) / 2
+
+        serialEdges = numpy.empty(2*len(pairs), dtype=numpy.int64)
+        serialEdges[0::2] = startVertices + 1
+        serialEdges[1::2] = endVertices + 1
+        return serialEdges
+
+    def sampleProbBlocks(self, prob, randomState, blockSize):
+        """ Samples G(n,p) block by block. Every possible edge is chosen independently with probability prob
+
+            @param prob Probability of choosing an edge
+            @param randomState numpy.random.RandomState used for drawing the skips
+            @param blockSize Number of skips drawn at once
+            @return Iterator over numpy arrays of alternating start and end vertex numbers
+        """
+        if prob <= 0:
+            return
+
+        # numpy's geometric distribution counts the trials up to and including the first success, so it is the
+        # distance from one chosen edge to the next
+        position = -1
+        while True:
+            pairs = position + numpy.cumsum(randomState.geometric(prob, blockSize))
+            if pairs[-1] >= self.noOfPairs:
+                pairs = pairs[pairs < self.noOfPairs]
+                if len(pairs):
+                    yield self.getEdges(pairs)
+                return
+            position = pairs[-1]
+            yield self.getEdges(pairs)
+
+    def sampleCount(self, noOfEdges, randomState):
+        """ Samples G(n,m). Exactly noOfEdges distinct possible edges are chosen uniformly
+
+            @param noOfEdges Number of edges to choose, at most ErdosRenyiSampler::noOfPairs
+            @param randomState numpy.random.RandomState used for drawing the edges
+            @return Numpy array of alternating start and end vertex numbers, ordered by edge number
+        """
+        return self.getEdges(self.samplePairs(noOfEdges, randomState))
+
+    def samplePairs(self, noOfEdges, randomState):
+        """ Draws distinct numbers of possible edges. Dense graphs are drawn through the edges left out
+
+            @param noOfEdges Number of numbers to draw
+            @param randomState numpy.random.RandomState used for drawing the numbers
+            @return Sorted numpy array of numbers of possible edges
+        """
+        noOfPairs = self.noOfPairs
+        if noOfEdges > noOfPairs / 2:
+            leftOut = self.samplePairs(noOfPairs - noOfEdges, randomState)
+            keep = numpy.ones(noOfPairs, dtype=bool)
+            keep[leftOut] = False
+            return numpy.nonzero(keep)[0]
+
+        # At most half of the numbers are taken, so every round draws at least half of the missing ones anew
+        pairs = numpy.empty(0, dtype=numpy.int64)
+        while len(pairs) < noOfEdges:
+            missingPairs = noOfEdges - len(pairs)
+            drawn = randomState.randint(0, noOfPairs, 2*missingPairs + 16).astype(numpy.int64)
+            pairs = numpy.union1d(pairs, drawn)
+
+        if len(pairs) > noOfEdges:
+            pairs = numpy.sort(pairs[randomState.permutation(len(pairs))[:noOfEdges]])
+        return pairs
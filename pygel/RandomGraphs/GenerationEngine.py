@@ -0,0 +1,160 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import threading, Queue, multiprocessing, ctypes
+from multiprocessing.sharedctypes import RawArray
+import numpy
+from RMATSampler import *
+from ChooseEdges import *
+from GenerationRun import *
+from pygel.Exceptions.Exceptions import *
+
+
+class GenerationEngine:
+    """ Reusable engine generating edges with a pool of workers. The edges are split into chunks of a fixed size,
+        and the workers take the chunks from a shared work queue, so fast workers take more chunks than slow ones.
+        Every chunk has its own random number stream and its own slice of the result, so a seeded generation gives
+        the same edges whatever the number of workers and the order in which the chunks are done. All state of a
+        generation is local to GenerationEngine::start, so one engine can run any number of generations, one
+        after the other or at the same time from several threads. GenerationEngine::start does not wait for the
+        workers, so services can hand out the chunks as they finish
+
+        \ingroup RandomGraphs
+    """
+
+    ## Default number of edges of a chunk
+    chunkSize = 16*ChooseEdges.blockSize
+
+    def __init__(self, noOfWorkers, workerType='thread', chunkSize=None):
+        """ Constructs an engine
+
+            @param noOfWorkers Number of workers taking chunks from the work queue
+            @param workerType Kind of workers. Can take values: <br>
+                              'thread' = threads, which share the interpreter lock <br>
+                              'process' = processes, which scale with the number of cores
+            @param chunkSize Number of edges of a chunk. Defaults to GenerationEngine::chunkSize
+        """
+        ## Number of workers taking chunks from the work queue
+        self.noOfWorkers = noOfWorkers
+
+        ## Kind of workers
+        self.workerType = workerType
+
+        ## Number of edges of a chunk
+        self.chunkSize = chunkSize
+        if chunkSize is None:
+            self.chunkSize = GenerationEngine.chunkSize
+
+    def start(self, noOfEdges, noSelfLoops, sampler, size, seed=None, permutation=None, progress=None):
+        """ Starts generating edges in the background and returns at once
+
+            @param noOfEdges Number of edges to generate
+            @param noSelfLoops If true (set to 1) self loops are discarded from the chunks
+            @param sampler Sampler of the edges, e.g. RandomGraphs::RMATSampler or RandomGraphs::KroneckerSampler
+            @param size Largest vertex number the sampler can return
+            @param seed Seed of the generation. Chunk i uses random number stream i. If None, the edges are not
+                        reproducible
+            @param permutation RandomGraphs::VertexPermutation applied to the vertex numbers. If None, the vertex numbers
+                               are not permuted
+            @param progress Started RandomGraphs::GenerationProgress with one counter per chunk, whose targets are
+                            given by GenerationEngine::getChunkSizes. If None, progress is not reported
+            @return RandomGraphs::GenerationRun of the started workers
+        """
+        vertexType = RMATSampler.getVertexType(size, size)
+        noOfChunks = (noOfEdges + self.chunkSize - 1) / self.chunkSize
+
+        # Results are written into shared memory, so threads and processes are handled alike. A chunk count stays -1
+        # until the chunk is done
+        sharedEdges = RawArray(numpy.ctypeslib.as_ctypes_type(vertexType), 2*noOfEdges)
+        chunkCounts = RawArray(ctypes.c_int64, noOfChunks)
+        for i in range(noOfChunks):
+            chunkCounts[i] = -1
+
+        if self.workerType == 'process':
+            workQueue = multiprocessing.Queue()
+            doneQueue = multiprocessing.Queue()
+            workerClass = multiprocessing.Process
+        else:
+            workQueue = Queue.Queue()
+            doneQueue = Queue.Queue()
+            workerClass = threading.Thread
+
+        for i in range(noOfChunks):
+            workQueue.put(i)
+        for i in range(self.noOfWorkers):
+            workQueue.put(None)
+
+        workers = []
+        for i in range(self.noOfWorkers):
+            worker = workerClass(target=GenerationEngine.runWorker,
+                                 args=(workQueue, noOfEdges, self.chunkSize, noSelfLoops, sampler, seed, permutation,
+                                       sharedEdges, chunkCounts, doneQueue, i, progress))
+            workers.append(worker)
+            worker.start()
+
+        return GenerationRun(workers, self.workerType, sharedEdges, chunkCounts, self.chunkSize, vertexType, doneQueue)
+
+    def getChunkSizes(self, noOfEdges):
+        """ Number of edges of every chunk of a generation. Chunks are taken by whichever worker is free, so only the
+            chunks have a number of edges known in advance
+
+            @param noOfEdges Number of edges to generate
+            @return List with the number of edges of every chunk
+        """
+        return [min(self.chunkSize, noOfEdges - start) for start in xrange(0, noOfEdges, self.chunkSize)]
+
+    def generate(self, noOfEdges, noSelfLoops, sampler, size, seed=None, permutation=None, progress=None):
+        """ Generates edges and waits for them. @see GenerationEngine::start
+
+            @return Numpy array of alternating start and end vertex numbers, in the order of the chunks
+            @throws PackageExceptions::GenerationError
+        """
+        return self.start(noOfEdges, noSelfLoops, sampler, size, seed, permutation, progress).getResult()
+
+    def runWorker(workQueue, noOfEdges, chunkSize, noSelfLoops, sampler, seed, permutation, sharedEdges, chunkCounts,
+                  doneQueue, index, progress):
+        """ Body of a worker. Takes chunks from the work queue until it gets None
+
+            @see GenerationEngine::generate
+        """
+        serialEdges = numpy.ctypeslib.as_array(sharedEdges)
+        while True:
+            chunk = workQueue.get()
+            if chunk is None:
+                return
+
+            noOfChunkEdges = min(chunkSize, noOfEdges - chunk*chunkSize)
+            blocks = sampler.sampleBlocks(noOfChunkEdges, noSelfLoops, RMATSampler.getRandomState(seed, chunk),
+                                          ChooseEdges.blockSize, permutation)
+            if progress is not None:
+                blocks = ChooseEdges.countBlocks(blocks, progress, chunk)
+
+            start = position = 2*chunk*chunkSize
+            for block in blocks:
+                serialEdges[position:position+len(block)] = block
+                position += len(block)
+            chunkCounts[chunk] = (position - start)/2
+            doneQueue.put(chunk)
+
+    runWorker = staticmethod(runWorker)
@@ -0,0 +1,176 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import sys, time, threading, ctypes
+from multiprocessing.sharedctypes import RawArray
+
+
+class GenerationProgress:
+    """ Progress of a generation with several workers. Every worker adds the number of edges of a block to its own
+        counter once per block, so there is no work per edge and no lock. The counters are in shared memory, so they
+        can be updated by RandomGraphs::ChooseEdgesProcess processes as well as by RandomGraphs::ChooseEdges threads.
+        A reporter thread of the calling process reads them at a fixed interval and hands the edges, edges per
+        second and remaining time of every worker and of the whole generation to a callback
+
+        \ingroup RandomGraphs
+    """
+
+    ## Largest number of counters whose shares GenerationProgress::printProgress lists one by one
+    maxListedCounters = 16
+
+    def __init__(self, interval=1.0, callback=None):
+        """ Constructs a progress monitor
+
+            @param interval Seconds between two reports
+            @param callback Function called with the statistics of the workers and the total.
+                            @see GenerationProgress::getStats. If None, GenerationProgress::printProgress is used
+        """
+        ## Seconds between two reports
+        self.interval = interval
+
+        ## Function called with the statistics of the workers and the total. If None, GenerationProgress::printProgress
+        ## is used
+        self.callback = callback
+
+        ## Number of edges to generate by every worker
+        self.workerEdges = []
+
+        ## What a counter stands for, e.g. 'worker' or 'chunk'. Used as the label of the counters in the reports
+        self.counterName = 'worker'
+
+        ## Number of edges generated by every worker so far. Shared array of unsigned 64 bit integers
+        self.counts = None
+
+        ## Time at which the generation was started
+        self.startTime = None
+
+        ## Event telling the reporter thread to stop
+        self.stopEvent = None
+
+        ## Reporter thread
+        self.reporter = None
+
+    def start(self, workerEdges, counterName='worker'):
+        """ Resets the counters and starts the reporter thread. Must be called before the workers are started
+
+            @param workerEdges List with the number of edges to generate by every worker
+            @param counterName What a counter stands for. Workers taking work from a queue do not have a number of
+                               edges known in advance, so they count under the index of the chunk instead and
+                               counterName is 'chunk'
+        """
+        # A reporter left over from a generation that failed is stopped without a report
+        if self.reporter is not None:
+            self.stopEvent.set()
+
+        self.workerEdges = list(workerEdges)
+        self.counterName = counterName
+        self.counts = RawArray(ctypes.c_uint64, len(self.workerEdges))
+        self.startTime = time.time()
+        self.stopEvent = threading.Event()
+        self.reporter = threading.Thread(target=self.reportPeriodically)
+        self.reporter.setDaemon(True)
+        self.reporter.start()
+
+    def update(self, index, noOfEdges):
+        """ Adds generated edges to the counter of a worker. Called once per block by the worker
+
+            @param index Index of the worker
+            @param noOfEdges Number of edges of the block
+        """
+        self.counts[index] += noOfEdges
+
+    def stop(self):
+        """ Stops the reporter thread and reports the final state
+        """
+        if self.reporter is None:
+            return
+        self.stopEvent.set()
+        self.reporter.join()
+        self.reporter = None
+        self.report()
+
+    def reportPeriodically(self):
+        """ Body of the reporter thread
+        """
+        while True:
+            self.stopEvent.wait(self.interval)
+            if self.stopEvent.isSet():
+                return
+            self.report()
+
+    def report(self):
+        """ Hands the current statistics to the callback
+        """
+        workerStats, totalStats = self.getStats()
+        if self.callback is None:
+            GenerationProgress.printProgress(workerStats, totalStats, self.counterName)
+        else:
+            self.callback(workerStats, totalStats)
+
+    def getStats(self):
+        """ Statistics of the workers and the whole generation
+
+            @return Tuple of a list with the statistics of every worker and the statistics of the whole generation. The
+                    statistics are tuples of the edges generated, the edges to generate, the edges per second and the
+                    estimated seconds left, which is None as long as no edge was generated
+        """
+        elapsed = max(time.time() - self.startTime, 1e-9)
+        counts = [int(count) for count in self.counts]
+
+        def getStat(generated, target):
+            rate = generated / elapsed
+            eta = None
+            if generated > 0:
+                eta = max(target - generated, 0) / rate
+            return generated, target, rate, eta
+
+        workerStats = [getStat(counts[i], self.workerEdges[i]) for i in range(len(counts))]
+        return workerStats, getStat(sum(counts), sum(self.workerEdges))
+
+    def printProgress(workerStats, totalStats, counterName='worker'):
+        """ Default callback. Writes one line with the total and the share of every worker to standard error. The
+            shares are left out when there are more than GenerationProgress::maxListedCounters counters
+
+            @param workerStats Statistics of the workers. @see GenerationProgress::getStats
+            @param totalStats Statistics of the whole generation
+            @param counterName Label of the counters. @see GenerationProgress::start
+        """
+        def formatStat(stat):
+            generated, target, rate, eta = stat
+            percentage = 100.0
+            if target > 0:
+                percentage = 100.0 * generated / target
+            etaString = '?'
+            if eta is not None:
+                etaString = '%.1fs' % (eta)
+            return '%.1f%% %d/%d edges, %.0f edges/s, ETA %s' % (percentage, generated, target, rate, etaString)
+
+        line = 'Progress: ' + formatStat(totalStats)
+        if 1 < len(workerStats) <= GenerationProgress.maxListedCounters:
+            line += ''.join([' | %s %d: %.1f%%' % (counterName, i, 100.0 * stat[0] / max(stat[1], 1))
+                             for i, stat in enumerate(workerStats)])
+        sys.stderr.write(line + '\n')
+        sys.stderr.flush()
+
+    printProgress = staticmethod(printProgress)
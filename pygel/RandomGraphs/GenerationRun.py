@@ -0,0 +1,163 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import Queue
+import numpy
+from pygel.Exceptions.Exceptions import *
+
+
+class GenerationRun:
+    """ Generation started by RandomGraphs::GenerationEngine::start. The workers run in the background, so the caller,
+        e.g. the event loop of a service, is not blocked. Finished chunks can be taken as they come with
+        GenerationRun::pollChunks without blocking or with GenerationRun::getChunks, and all edges with
+        GenerationRun::getResult
+
+        \ingroup RandomGraphs
+    """
+
+    ## Seconds waited for a finished chunk before the workers are checked
+    pollInterval = 0.1
+
+    def __init__(self, workers, workerType, sharedEdges, chunkCounts, chunkSize, vertexType, doneQueue):
+        """ Constructs a run of started workers
+
+            @param workers Started threads or processes
+            @param workerType Kind of workers. @see RandomGraphs::GenerationEngine
+            @param sharedEdges Shared buffer of alternating start and end vertex numbers. Chunk i starts at edge
+                               i*chunkSize
+            @param chunkCounts Shared buffer with the number of edges of every chunk, -1 until the chunk is done
+            @param chunkSize Number of edges of a chunk
+            @param vertexType Numpy type of the vertex numbers
+            @param doneQueue Queue receiving the index of every finished chunk
+        """
+        ## Started threads or processes
+        self.workers = workers
+
+        ## Kind of workers
+        self.workerType = workerType
+
+        ## Shared buffer of alternating start and end vertex numbers
+        self.sharedEdges = sharedEdges
+
+        ## Shared buffer with the number of edges of every chunk
+        self.chunkCounts = chunkCounts
+
+        ## Number of edges of a chunk
+        self.chunkSize = chunkSize
+
+        ## Numpy type of the vertex numbers
+        self.vertexType = vertexType
+
+        ## Queue receiving the index of every finished chunk
+        self.doneQueue = doneQueue
+
+        ## Number of chunks not yet taken from GenerationRun::doneQueue
+        self.remainingChunks = len(chunkCounts)
+
+    def isDone(self):
+        """ Tells whether all workers have finished. Does not block
+
+            @return True if no worker is running
+        """
+        for worker in self.workers:
+            if worker.is_alive():
+                return False
+        return True
+
+    def getChunkEdges(self, chunk):
+        """ Edges of a finished chunk
+
+            @param chunk Index of the chunk
+            @return Numpy array of alternating start and end vertex numbers. It is a view of the shared buffer
+        """
+        offset = 2*chunk*self.chunkSize
+        return numpy.ctypeslib.as_array(self.sharedEdges)[offset:offset+2*self.chunkCounts[chunk]]
+
+    def pollChunks(self):
+        """ Takes the chunks finished since the last call without blocking
+
+            @return List of tuples of the index of a chunk and its edges. @see GenerationRun::getChunkEdges
+        """
+        chunks = []
+        while self.remainingChunks:
+            try:
+                chunk = self.doneQueue.get(False)
+            except Queue.Empty:
+                break
+            self.remainingChunks -= 1
+            chunks.append((chunk, self.getChunkEdges(chunk)))
+        return chunks
+
+    def getChunks(self):
+        """ Takes the chunks in the order they finish, blocking until the next one is done
+
+            @return Iterator over tuples of the index of a chunk and its edges. @see GenerationRun::getChunkEdges
+            @throws PackageExceptions::GenerationError
+        """
+        while self.remainingChunks:
+            try:
+                chunk = self.doneQueue.get(True, GenerationRun.pollInterval)
+            except Queue.Empty:
+                # Workers that failed leave chunks that never finish
+                if self.isDone() and self.doneQueue.empty():
+                    self.getResult()
+                continue
+            self.remainingChunks -= 1
+            yield chunk, self.getChunkEdges(chunk)
+
+    def checkWorkers(self):
+        """ Waits for the workers and checks that they succeeded
+
+            @throws PackageExceptions::GenerationError
+        """
+        # All workers are joined before a failure is reported, so none is left behind. A process cannot exit before
+        # the chunks it queued are read, so the queue is emptied while waiting. GenerationRun::getResult takes the
+        # edges of these chunks from the shared buffers
+        for worker in self.workers:
+            while worker.is_alive() and self.remainingChunks:
+                try:
+                    self.doneQueue.get(True, GenerationRun.pollInterval)
+                    self.remainingChunks -= 1
+                except Queue.Empty:
+                    pass
+            worker.join()
+        for i in range(len(self.workers)):
+            if self.workerType == 'process' and self.workers[i].exitcode != 0:
+                raise GenerationError(i, ErrorMessages.workerFailed)
+
+    def getResult(self):
+        """ Waits for the workers and collects the edges of all chunks, also of those already taken
+
+            @return Numpy array of alternating start and end vertex numbers, in the order of the chunks
+            @throws PackageExceptions::GenerationError
+        """
+        self.checkWorkers()
+
+        chunkEdgeLists = [numpy.empty(0, dtype=self.vertexType)]
+        for i in range(len(self.chunkCounts)):
+            if self.chunkCounts[i] < 0:
+                raise GenerationError(i, ErrorMessages.chunkNotGenerated)
+            chunkEdgeLists.append(self.getChunkEdges(i))
+
+        return numpy.concatenate(chunkEdgeLists)
@@ -0,0 +1,201 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import itertools
+import numpy
+
+from pygel.BaseElements.Vertex import *
+from pygel.BaseElements.Edge import *
+from pygel.Graph.NumberedEdgeUndirectedGraph import *
+from pygel.Exceptions.Exceptions import *
+from ChooseEdges import *
+from EdgeWriter import *
+
+
+class GeometricRandomGraph(NumberedEdgeUndirectedGraph):
+
+    """ Generates a random geometric graph. The vertices are points drawn uniformly from the unit square, cube or
+        hypercube, and every pair of points within the radius is joined. The points are put into a grid of cells at
+        least as wide as the radius, so only the pairs of points in the same or adjacent cells are candidates. The
+        candidates of many cell pairs are checked at once, which takes time linear in the number of vertices plus
+        edges. Vertices are numbered cell by cell, so close vertices get close vertex numbers
+        \ingroup RandomGraphs
+    """
+
+    ## Maximum number of candidate pairs checked at once, unless a single pair of cells has more
+    candidatesPerBatch = 16*ChooseEdges.blockSize
+
+    def __init__(self, size, radius, dimensions=2, seed=None):
+        """ Constructs an empty graph
+
+            @param size Number of vertices
+            @param radius Maximum distance of the points of an edge
+            @param dimensions Number of dimensions of the unit hypercube holding the points
+            @param seed Seed of the random number generator. With a seed the generated edges are reproducible
+            @throws PackageExceptions::DistError
+        """
+        NumberedEdgeUndirectedGraph.__init__(self)
+
+        if radius <= 0:
+            raise DistError(ErrorMessages.radiusOutOfRange)
+
+        ## Number of vertices
+        self.graphSize = size
+
+        ## Maximum distance of the points of an edge
+        self.radius = radius
+
+        ## Number of dimensions of the unit hypercube
+        self.dimensions = dimensions
+
+        ## Seed of the random number generator
+        self.seed = seed
+
+        ## Points of the vertices after a call to GeometricRandomGraph::generate. Row i is vertex i+1
+        self.points = numpy.empty((0, dimensions))
+
+        ## Temporary storage of edges. Numpy array of alternating start and end vertex numbers
+        self.serialEdgeList = numpy.empty(0, dtype=RMATSampler.getVertexType(size, size))
+
+    def generate(self, noOfThreads=1, noSelfLoops=1):
+        """ Generates the graph. Every edge goes from the lower to the higher vertex number
+
+            @param noOfThreads Ignored. The cells are searched in batches by the calling thread
+            @param noSelfLoops Ignored, as a point is never paired with itself
+        """
+        size = self.graphSize
+        dimensions = self.dimensions
+        vertexType = RMATSampler.getVertexType(size, size)
+        points = RMATSampler.getRandomState(self.seed, 0).random_sample((size, dimensions))
+
+        # Cells are at least as wide as the radius. There are no more cells than points, so that the index stays linear
+        cellsPerSide = max(1, min(int(1.0 / self.radius), int(size ** (1.0 / dimensions))))
+        strides = cellsPerSide ** numpy.arange(dimensions - 1, -1, -1, dtype=numpy.int64)
+        cellIds = numpy.dot(numpy.minimum((points * cellsPerSide).astype(numpy.int64), cellsPerSide - 1), strides)
+
+        points = points[numpy.argsort(cellIds)]
+        cellCounts = numpy.bincount(cellIds, minlength=cellsPerSide ** dimensions)
+        cellStarts = numpy.cumsum(cellCounts) - cellCounts
+
+        cells = numpy.nonzero(cellCounts)[0]
+        cellCoordinates = (cells[:, numpy.newaxis] // strides) % cellsPerSide
+
+        edgeLists = [numpy.empty(0, dtype=vertexType)]
+        for offset in GeometricRandomGraph.getHalfOffsets(dimensions):
+            neighborCoordinates = cellCoordinates + offset
+            valid = ((neighborCoordinates >= 0) & (neighborCoordinates < cellsPerSide)).all(axis=1)
+            firstCells = cells[valid]
+            secondCells = numpy.dot(neighborCoordinates[valid], strides)
+            occupied = cellCounts[secondCells] > 0
+            firstCells = firstCells[occupied]
+            secondCells = secondCells[occupied]
+
+            edgeLists.extend(self.getEdgesOfCellPairs(points, cellStarts, cellCounts, firstCells, secondCells,
+                                                      not any(offset), vertexType))
+
+        self.points = points
+        self.serialEdgeList = numpy.concatenate(edgeLists)
+
+    def getHalfOffsets(dimensions):
+        """ Offsets of the adjacent cells, of which only one of every pair of opposite offsets is kept, so that every
+            pair of cells is visited once
+
+            @param dimensions Number of dimensions
+            @return List of tuples, including the zero offset
+        """
+        return [offset for offset in itertools.product((-1, 0, 1), repeat=dimensions)
+                if not any(offset) or [step for step in offset if step][0] > 0]
+
+    getHalfOffsets = staticmethod(getHalfOffsets)
+
+    def getEdgesOfCellPairs(self, points, cellStarts, cellCounts, firstCells, secondCells, sameCell, vertexType):
+        """ Checks all pairs of points of pairs of cells batch by batch
+
+            @param points Numpy array of the points, sorted by cell
+            @param cellStarts Numpy array with the index of the first point of every cell
+            @param cellCounts Numpy array with the number of points of every cell
+            @param firstCells Numpy array of the first cells of the pairs
+            @param secondCells Numpy array of the second cells of the pairs
+            @param sameCell If true, the two cells of every pair are the same and every pair of points is checked once
+            @param vertexType Type of the vertex numbers
+            @return List of numpy arrays of alternating start and end vertex numbers
+        """
+        firstCounts = cellCounts[firstCells]
+        secondCounts = cellCounts[secondCells]
+        noOfCandidates = numpy.cumsum(firstCounts * secondCounts)
+        if len(noOfCandidates) == 0:
+            return []
+
+        # Gathering from one contiguous array per coordinate is faster than gathering rows of points
+        coordinateColumns = [numpy.ascontiguousarray(points[:, dimension]) for dimension in range(points.shape[1])]
+        squaredRadius = self.radius ** 2
+        batchEnds = numpy.searchsorted(noOfCandidates,
+                                       numpy.arange(GeometricRandomGraph.candidatesPerBatch, noOfCandidates[-1],
+                                                    GeometricRandomGraph.candidatesPerBatch), 'right')
+        batchEnds = numpy.unique(numpy.concatenate((batchEnds, [len(firstCells)])))
+
+        edgeLists = []
+        batchStart = 0
+        for batchEnd in batchEnds:
+            batch = slice(batchStart, batchEnd)
+            batchStart = batchEnd
+            pairCandidates = firstCounts[batch] * secondCounts[batch]
+            if not pairCandidates.sum():
+                continue
+
+            # Candidate k of a pair of cells is point k // width of the first cell and k % width of the second
+            pairs = numpy.repeat(numpy.arange(len(pairCandidates)), pairCandidates)
+            candidates = numpy.arange(len(pairs)) - numpy.repeat(numpy.cumsum(pairCandidates) - pairCandidates,
+                                                                 pairCandidates)
+            widths = secondCounts[batch][pairs]
+            firstPoints = cellStarts[firstCells[batch]][pairs] + candidates // widths
+            secondPoints = cellStarts[secondCells[batch]][pairs] + candidates % widths
+
+            squaredDistances = numpy.zeros(len(pairs))
+            for coordinates in coordinateColumns:
+                squaredDistances += (coordinates[firstPoints] - coordinates[secondPoints]) ** 2
+            keep = squaredDistances <= squaredRadius
+            if sameCell:
+                keep &= firstPoints < secondPoints
+
+            serialEdges = numpy.empty(2*keep.sum(), dtype=vertexType)
+            serialEdges[0::2] = numpy.minimum(firstPoints[keep], secondPoints[keep]) + 1
+            serialEdges[1::2] = numpy.maximum(firstPoints[keep], secondPoints[keep]) + 1
+            edgeLists.append(serialEdges)
+
+        return edgeLists
+
+    def populate(self):
+        """ Populate graph with edges generated after a call to GeometricRandomGraph::generate
+        """
+        serialEdgeList = self.serialEdgeList
+        self.addEdges(serialEdgeList[0::2], serialEdgeList[1::2])
+
+    def writeEdges(self, fileName, format):
+        """ Write edges to file
+
+            @param fileName File name to store edges
+            @param format Format of output file. @see RandomGraphs::EdgeWriter
+        """
+        EdgeWriter.writeSerialEdges(self.serialEdgeList, fileName, format, 0)
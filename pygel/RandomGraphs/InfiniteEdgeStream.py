@@ -0,0 +1,115 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import time
+import numpy
+from RMATSampler import *
+from ChooseEdges import *
+from pygel.Exceptions.Exceptions import *
+
+
+class InfiniteEdgeStream:
+    """ Endless stream of edges in batches, for load testing consumers of edges. No graph is built and only the batch
+        handed to the consumer is held in memory. The batches are drawn when the consumer asks for them, so a slow
+        consumer slows down the stream instead of making batches pile up. With a rate the stream is also paced: a
+        batch is not handed out before its due time, and time lost to a slow consumer is not made up with a burst
+
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, sampler, noSelfLoops, batchSize=ChooseEdges.blockSize, seed=None, permutation=None, rate=None,
+                 timeStep=None, startTime=0.0):
+        """ Constructs a stream
+
+            @param sampler Sampler of the edges, e.g. RandomGraphs::RMATSampler or RandomGraphs::KroneckerSampler
+            @param noSelfLoops If true (set to 1) self loops are discarded, so batches may be a little smaller than
+                               batchSize
+            @param batchSize Number of edges drawn for every batch
+            @param seed Seed of the stream. If None, the edges are not reproducible
+            @param permutation RandomGraphs::VertexPermutation applied to the vertex numbers. If None, the vertex numbers
+                               are not permuted
+            @param rate Maximum number of edges per second. If None, the stream is not paced
+            @param timeStep If given, every batch comes with synthetic timestamps, startTime for the first edge and
+                            timeStep more for every following edge. They do not depend on the pacing, so seeded streams
+                            have reproducible timestamps
+            @param startTime Timestamp of the first edge
+            @throws PackageExceptions::DistError
+        """
+        # A stream without edges per batch would never hand out a batch
+        if batchSize <= 0:
+            raise DistError(ErrorMessages.batchSizeOutOfRange)
+        if rate is not None and rate <= 0:
+            raise DistError(ErrorMessages.rateOutOfRange)
+        if timeStep is not None and timeStep <= 0:
+            raise DistError(ErrorMessages.timeStepOutOfRange)
+
+        ## Sampler of the edges
+        self.sampler = sampler
+
+        ## If true (set to 1) self loops are discarded
+        self.noSelfLoops = noSelfLoops
+
+        ## Number of edges drawn for every batch
+        self.batchSize = batchSize
+
+        ## Seed of the stream
+        self.seed = seed
+
+        ## Permutation of the vertex numbers. If None, the vertex numbers are not permuted
+        self.permutation = permutation
+
+        ## Maximum number of edges per second. If None, the stream is not paced
+        self.rate = rate
+
+        ## Synthetic time between two edges. If None, no timestamps are given
+        self.timeStep = timeStep
+
+        ## Timestamp of the first edge
+        self.startTime = startTime
+
+    def __iter__(self):
+        """ Iterates over the batches. Every iteration starts the stream anew from its seed
+
+            @return Iterator over numpy arrays of alternating start and end vertex numbers, or over tuples of such an
+                    array and a numpy array with the timestamps of its edges if InfiniteEdgeStream::timeStep is given
+        """
+        randomState = RMATSampler.getRandomState(self.seed, 0)
+        noOfEdges = 0
+        dueTime = time.time()
+
+        while True:
+            for block in self.sampler.sampleBlocks(self.batchSize, self.noSelfLoops, randomState, self.batchSize,
+                                                   self.permutation):
+                batchEdges = len(block)/2
+                if self.rate is not None:
+                    delay = dueTime - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                    dueTime = max(dueTime, time.time()) + batchEdges/float(self.rate)
+
+                if self.timeStep is None:
+                    yield block
+                else:
+                    yield block, self.startTime + (noOfEdges + numpy.arange(batchEdges))*self.timeStep
+                noOfEdges += batchEdges
@@ -0,0 +1,72 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+#
+#
+
+from DirectedPowerLawRandomGraph import *
+from KroneckerSampler import *
+
+
+class KroneckerRandomGraph(DirectedPowerLawRandomGraph):
+
+    """ Generates a stochastic Kronecker graph from a KxK initiator matrix, optionally with per-level noise as in the
+        Graph500 SKG generator. Generation, streaming and sharding work as in RandomGraphs::DirectedPowerLawRandomGraph
+        \ingroup RandomGraphs
+    """
+
+    ## Stream id of the random numbers used for the noise. Not used by any worker
+    noiseStreamId = 0xffffffff
+
+    def __init__(self, initiator, levels, noOfEdges, noise=0, seed=None, permutationKey=None):
+        """ Constructs an empty graph with K**levels vertices
+
+            @param initiator KxK initiator matrix given as a list of rows. @see RandomGraphs::KroneckerSampler
+            @param levels Number of Kronecker products
+            @param noOfEdges Number of edges to generate
+            @param noise Per-level noise. @see RandomGraphs::KroneckerSampler
+            @param seed Seed of the random number generators. With a seed the generated edges are reproducible
+            @param permutationKey Key scrambling the vertex numbers. @see RandomGraphs::DirectedPowerLawRandomGraph
+            @throws PackageExceptions::DistError
+        """
+        DirectedPowerLawRandomGraph.__init__(self, len(initiator) ** levels, noOfEdges, seed, permutationKey)
+
+        ## Sampler of the edges
+        self.sampler = KroneckerSampler(initiator, levels, noise,
+                                        RMATSampler.getRandomState(seed, KroneckerRandomGraph.noiseStreamId))
+
+    def setProbs(self, probA, probB, probC, probD):
+        """ Replaces the initiator by the 2x2 initiator [[probA, probC], [probB, probD]] without noise, which gives
+            the same graph as RandomGraphs::DirectedPowerLawRandomGraph with these probabilities. Only valid for
+            graphs constructed with a 2x2 initiator, as the number of vertices does not change
+
+            @param probA Probability of choosing quadrant A
+            @param probB Probability of choosing quadrant B
+            @param probC Probability of choosing quadrant C
+            @param probD Probability of choosing quadrant D
+            @throws PackageExceptions::DistError
+        """
+        if self.sampler.initiatorSize != 2:
+            raise DistError(ErrorMessages.initiatorNotTwoByTwo)
+
+        DirectedPowerLawRandomGraph.setProbs(self, probA, probB, probC, probD)
+        # Quadrant B of RandomGraphs::RMATSampler raises the start vertex and quadrant C the end vertex, so they are
+        # the cells below and right of A in the initiator
+        self.sampler = KroneckerSampler([[probA, probC], [probB, probD]], self.sampler.levels)
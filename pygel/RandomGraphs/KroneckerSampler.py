@@ -0,0 +1,147 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+#
+#
+
+import numpy
+from RMATSampler import *
+from pygel.Exceptions.Exceptions import *
+
+
+class KroneckerSampler(RMATSampler):
+    """ Vectorized sampler for stochastic Kronecker graphs with a KxK initiator matrix. At every level the cell of the
+        initiator is drawn for a whole block of edges at once from a precomputed alias table, so a level costs the
+        same whatever the size of the initiator. Vertex numbers run from 1 to K**levels
+
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, initiator, levels, noise=0, randomState=None):
+        """ Constructs a sampler
+
+            @param initiator KxK initiator matrix given as a list of rows. Cell [i][j] is the probability of an edge
+                             from block i to block j, i.e. rows select the start vertex and columns the end vertex.
+                             The cells add to one. The quadrants A, B, C and D of RandomGraphs::RMATSampler are the
+                             initiator [[A, C], [B, D]], as B raises the start vertex and C the end vertex
+            @param levels Number of Kronecker products, i.e. recursion levels
+            @param noise If greater than 0, every cell of the initiator is multiplied at every level by its own random
+                         factor drawn uniformly from [1-noise, 1+noise] and the level is normalized again, similar to
+                         the noisy SKG generator of Graph500. Must be less than 1
+            @param randomState numpy.random.RandomState used for drawing the noise
+            @throws PackageExceptions::DistError
+        """
+        initiator = numpy.array(initiator, dtype=numpy.float64)
+        if initiator.ndim != 2 or initiator.shape[0] != initiator.shape[1]:
+            raise DistError(ErrorMessages.initiatorNotSquare)
+        if abs(initiator.sum() - 1) > 1e-9:
+            raise DistError(ErrorMessages.distAddOne)
+        if noise < 0 or noise >= 1:
+            raise DistError(ErrorMessages.noiseOutOfRange)
+
+        ## Number of rows (and columns) of the initiator
+        self.initiatorSize = initiator.shape[0]
+
+        ## Number of recursion levels
+        self.levels = levels
+
+        ## Vertex number of the first row of the adjacency matrix
+        self.startVertX = 1
+
+        ## Vertex number of the first column of the adjacency matrix
+        self.startVertY = 1
+
+        ## Alias tables of the levels. Tuples of the acceptance probabilities and aliases of the cells
+        self.aliasTables = []
+
+        cellProbs = initiator.ravel()
+        if noise == 0:
+            self.aliasTables = [KroneckerSampler.buildAliasTable(cellProbs)] * levels
+        else:
+            if randomState is None:
+                randomState = numpy.random.RandomState()
+            for level in range(levels):
+                levelProbs = cellProbs * randomState.uniform(1 - noise, 1 + noise, len(cellProbs))
+                self.aliasTables.append(KroneckerSampler.buildAliasTable(levelProbs / levelProbs.sum()))
+
+    def buildAliasTable(probs):
+        """ Builds an alias table with Vose's method
+
+            @param probs Numpy array of probabilities adding to one
+            @return Tuple of numpy arrays with the acceptance probability and the alias of every outcome
+        """
+        noOfOutcomes = len(probs)
+        scaledProbs = probs * noOfOutcomes
+        acceptance = numpy.ones(noOfOutcomes)
+        alias = numpy.arange(noOfOutcomes)
+
+        small = [i for i in range(noOfOutcomes) if scaledProbs[i] < 1]
+        large = [i for i in range(noOfOutcomes) if scaledProbs[i] >= 1]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            acceptance[less] = scaledProbs[less]
+            alias[less] = more
+            scaledProbs[more] -= 1 - scaledProbs[less]
+            if scaledProbs[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # The outcomes left over differ from one only by rounding errors and are always accepted
+        return acceptance, alias
+
+    buildAliasTable = staticmethod(buildAliasTable)
+
+    def sample(self, noOfEdges, randomState):
+        """ Samples a block of edges
+
+            @param noOfEdges Number of edges to sample
+            @param randomState numpy.random.RandomState used for drawing the cells
+            @return Tuple of two numpy arrays holding the start and end vertex numbers
+        """
+        initiatorSize = self.initiatorSize
+        noOfCells = initiatorSize * initiatorSize
+
+        startVertices = numpy.empty(noOfEdges, dtype=numpy.int64)
+        startVertices.fill(self.startVertX)
+        endVertices = numpy.empty(noOfEdges, dtype=numpy.int64)
+        endVertices.fill(self.startVertY)
+
+        # Offsets of the rows and columns of the cells, scaled to the size of the blocks at a level
+        cells = numpy.arange(noOfCells)
+        rows = cells // initiatorSize
+        columns = cells % initiatorSize
+        blockSize = initiatorSize ** self.levels
+
+        for acceptance, alias in self.aliasTables:
+            blockSize /= initiatorSize
+
+            # A single uniform number picks the cell with its integer part and decides between the cell and its
+            # alias with its fractional part
+            draws = randomState.random_sample(noOfEdges) * noOfCells
+            cells = draws.astype(numpy.int64)
+            draws -= cells
+            cells = numpy.where(draws < acceptance[cells], cells, alias[cells])
+
+            startVertices += (rows * blockSize)[cells]
+            endVertices += (columns * blockSize)[cells]
+
+        return startVertices, endVertices
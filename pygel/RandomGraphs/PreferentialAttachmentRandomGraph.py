@@ -0,0 +1,124 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+
+from pygel.BaseElements.Vertex import *
+from pygel.BaseElements.Edge import *
+from pygel.Graph.NumberedEdgeDirectedGraph import *
+from pygel.Exceptions.Exceptions import *
+from ChooseEdges import *
+from EdgeWriter import *
+
+
+class PreferentialAttachmentRandomGraph(NumberedEdgeDirectedGraph):
+
+    """ Generates a Barabasi-Albert preferential attachment graph. Vertices arrive one after the other and every new
+        vertex adds edges to existing vertices chosen with probability proportional to their degree. Uses the array of
+        repeated endpoints of Batagelj and Brandes, "Efficient generation of large random networks" (2005): a vertex
+        appears in it once per edge end, so a uniform entry of the array is a vertex chosen proportionally to its
+        degree, and every edge costs O(1). Edges point from the new vertex to the chosen one
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, size, noOfEdgesPerVertex, seed=None):
+        """ Constructs an empty graph
+
+            @param size Number of vertices to generate
+            @param noOfEdgesPerVertex Number of edges added by every new vertex
+            @param seed Seed of the random number generator. With a seed the generated edges are reproducible
+        """
+        NumberedEdgeDirectedGraph.__init__(self)
+
+        ## Number of vertices to generate
+        self.graphSize = size
+
+        ## Number of edges added by every new vertex
+        self.noOfEdgesPerVertex = noOfEdgesPerVertex
+
+        ## Number of edges to generate
+        self.noOfEdges = size * noOfEdgesPerVertex
+
+        ## Seed of the random number generator
+        self.seed = seed
+
+        ## Temporary storage of edges. Numpy array of alternating start and end vertex numbers
+        self.serialEdgeList = numpy.empty(0, dtype=RMATSampler.getVertexType(size, size))
+
+    def generate(self, noOfThreads, noSelfLoops, verticesPerStep=None):
+        """ Generates the graph. Edge k is stored at positions 2k and 2k+1 of the array of repeated endpoints, and its
+            end is a copy of a uniform entry from positions 0 to 2k. The vertices are added in steps of many vertices
+            at once. Ends that copy an entry of the same step are resolved in a few more vectorized passes, so the
+            graph is the same for every step size
+
+            @param noOfThreads Ignored. Every step depends on the ones before it, so a single thread generates the
+                               graph. Kept for the signature of RandomGraphs::DirectedPowerLawRandomGraph::generate
+            @param noSelfLoops If true (set to 1) self loops are discarded in the resulting graph.
+            @param verticesPerStep Number of vertices added per step. Defaults to ChooseEdges::blockSize edges per step
+        """
+        noOfEdgesPerVertex = self.noOfEdgesPerVertex
+        noOfEdges = self.noOfEdges
+        if verticesPerStep is None:
+            verticesPerStep = max(1, ChooseEdges.blockSize / max(1, noOfEdgesPerVertex))
+        edgesPerStep = verticesPerStep * noOfEdgesPerVertex
+
+        randomState = RMATSampler.getRandomState(self.seed, 0)
+
+        # Even positions hold the new vertices and are known in advance. Odd positions are filled step by step
+        endpoints = numpy.empty(2*noOfEdges, dtype=numpy.int64)
+        endpoints[0::2] = numpy.arange(noOfEdges) / max(1, noOfEdgesPerVertex)
+
+        for firstEdge in xrange(0, noOfEdges, max(1, edgesPerStep)):
+            edges = numpy.arange(firstEdge, min(noOfEdges, firstEdge + edgesPerStep))
+            copied = (randomState.random_sample(len(edges)) * (2*edges + 1)).astype(numpy.int64)
+
+            # Entries before the step and even entries are known. Odd entries of the step refer to an earlier edge of
+            # the step, which is resolved in an earlier pass
+            pending = numpy.ones(len(edges), dtype=bool)
+            while pending.any():
+                known = pending & ((copied < 2*firstEdge + 1) | (copied % 2 == 0) |
+                                   ~pending[numpy.maximum(copied - 2*firstEdge - 1, 0) / 2])
+                endpoints[2*edges[known] + 1] = endpoints[copied[known]]
+                pending &= ~known
+
+        serialEdgeList = endpoints + 1
+        if noSelfLoops:
+            serialEdgeList = serialEdgeList.reshape(-1, 2)
+            serialEdgeList = serialEdgeList[serialEdgeList[:, 0] != serialEdgeList[:, 1]].ravel()
+
+        self.serialEdgeList = serialEdgeList.astype(RMATSampler.getVertexType(self.graphSize, self.graphSize))
+
+    def populate(self):
+        """ Populate graph with edges generated after a call to PreferentialAttachmentRandomGraph::generate
+        """
+        serialEdgeList = self.serialEdgeList
+        self.addEdges(serialEdgeList[0::2], serialEdgeList[1::2])
+
+    def writeEdges(self, fileName, format):
+        """ Write edges to file
+
+            @param fileName File name to store edges
+            @param format Format of output file. @see RandomGraphs::EdgeWriter
+        """
+        EdgeWriter.writeSerialEdges(self.serialEdgeList, fileName, format, 1)
@@ -0,0 +1,184 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+from RMATSampler import *
+
+
+class RMATFitter:
+    """ Fits the quadrant probabilities of the RMAT algorithm to target in- and out-degree distributions without
+        generating any graph. The out-degree of a vertex only depends on probB+probD, the probability of moving the
+        start vertex to the second half at a level, and the in-degree only on probC+probD. The probability of every
+        vertex is computed exactly for the levels of RandomGraphs::RMATSampler, and the expected number of vertices of
+        every degree follows from a mixture of Poisson distributions. Each of the two sums is then found by a one
+        dimensional search
+
+        \ingroup RandomGraphs
+    """
+
+    ## Number of values tried on the grid of a search before it is refined
+    noOfGridPoints = 25
+
+    ## Number of golden section steps refining a search
+    noOfRefinements = 20
+
+    ## Number of classes per factor e of the expected degrees in the Poisson mixture
+    classesPerE = 64
+
+    def __init__(self, size, noOfEdges):
+        """ Constructs a fitter for a graph
+
+            @param size Number of vertices of the graph. @see RandomGraphs::DirectedPowerLawRandomGraph
+            @param noOfEdges Number of edges of the graph
+        """
+        ## Number of vertices of the graph
+        self.size = size
+
+        ## Number of edges of the graph
+        self.noOfEdges = noOfEdges
+
+        ## Offsets of the vertex numbers at the levels of the RMAT recursion
+        self.offsets = RMATSampler(1, size, 1, size, 0.25, 0.25, 0.25, 0.25).offsetsX
+
+    def getVertexProbs(self, secondHalfProb):
+        """ Computes the probability of every vertex being the start (or end) vertex of an edge
+
+            @param secondHalfProb Probability of moving to the second half at a level, i.e. probB+probD for start
+                                  vertices and probC+probD for end vertices
+            @return Numpy array with the probability of every vertex
+        """
+        vertexProbs = numpy.zeros(self.size)
+        vertexProbs[0] = 1
+        width = 1
+        for offset in self.offsets:
+            secondHalf = vertexProbs[:width] * secondHalfProb
+            vertexProbs[:width] *= 1 - secondHalfProb
+            vertexProbs[offset:offset+width] += secondHalf
+            width = offset + width
+        return vertexProbs
+
+    def getExpectedDegreeDistribution(self, secondHalfProb, maxDegree):
+        """ Computes the expected degree distribution. The degree of a vertex is binomial, which is approximated by a
+            Poisson distribution, and vertices with almost the same expected degree are grouped into one class
+
+            @param secondHalfProb @see RMATFitter::getVertexProbs
+            @param maxDegree Largest degree computed
+            @return Numpy array with the expected number of vertices of every degree from 0 to maxDegree
+        """
+        expectedDegrees = self.getVertexProbs(secondHalfProb) * self.noOfEdges
+        distribution = numpy.zeros(maxDegree + 1)
+
+        positive = expectedDegrees > 0
+        distribution[0] = len(expectedDegrees) - positive.sum()
+        expectedDegrees = expectedDegrees[positive]
+
+        classes = numpy.round(numpy.log(expectedDegrees) * RMATFitter.classesPerE).astype(numpy.int64)
+        classes, classIndices, classSizes = numpy.unique(classes, return_inverse=True, return_counts=True)
+        classMeans = numpy.bincount(classIndices, weights=expectedDegrees) / classSizes
+
+        degrees = numpy.arange(maxDegree + 1)
+        logFactorials = numpy.concatenate(([0], numpy.cumsum(numpy.log(degrees[1:]))))
+        logProbs = (degrees[numpy.newaxis, :] * numpy.log(classMeans)[:, numpy.newaxis] - classMeans[:, numpy.newaxis]
+                    - logFactorials[numpy.newaxis, :])
+        distribution += numpy.dot(classSizes, numpy.exp(logProbs))
+        return distribution
+
+    def getDistance(expected, target):
+        """ Distance between two degree distributions. Degrees are grouped into bins growing by powers of two, so the
+            head and the tail of a power law weigh the same
+
+            @param expected Numpy array with the expected number of vertices of every degree
+            @param target Numpy array with the target number of vertices of every degree, of the same length
+            @return Sum of the squared differences of the logarithms of the bin counts
+        """
+        bins = numpy.log2(numpy.arange(1, len(expected) + 1)).astype(numpy.int64)
+        expectedBins = numpy.bincount(bins, weights=expected)
+        targetBins = numpy.bincount(bins, weights=target)
+        return ((numpy.log1p(expectedBins) - numpy.log1p(targetBins)) ** 2).sum()
+
+    getDistance = staticmethod(getDistance)
+
+    def fitSecondHalfProb(self, degreeDistribution):
+        """ Searches the probability of moving to the second half that fits a degree distribution best. Probabilities
+            above 0.5 would only move the hubs to the high vertex numbers, so the search is over (0, 0.5]
+
+            @param degreeDistribution Dictionary indexed on degree. Values are the number of nodes for a degree, as
+                                      returned by NumberedEdgeDirectedGraph::getOutDegreeDistribution
+            @return Best probability found
+        """
+        maxDegree = max(degreeDistribution.keys())
+        target = numpy.zeros(maxDegree + 1)
+        for degree, count in degreeDistribution.items():
+            target[degree] = count
+
+        distances = {}
+        def getDistance(secondHalfProb):
+            if secondHalfProb not in distances:
+                expected = self.getExpectedDegreeDistribution(secondHalfProb, maxDegree)
+                distances[secondHalfProb] = RMATFitter.getDistance(expected, target)
+            return distances[secondHalfProb]
+
+        grid = numpy.linspace(0.5 / RMATFitter.noOfGridPoints, 0.5, RMATFitter.noOfGridPoints)
+        best = min(range(len(grid)), key=lambda i: getDistance(grid[i]))
+
+        # Golden section search between the neighbors of the best grid point
+        low = grid[max(best - 1, 0)]
+        high = grid[min(best + 1, len(grid) - 1)]
+        ratio = (numpy.sqrt(5) - 1) / 2
+        for i in range(RMATFitter.noOfRefinements):
+            left = high - ratio * (high - low)
+            right = low + ratio * (high - low)
+            if getDistance(left) < getDistance(right):
+                high = right
+            else:
+                low = left
+
+        return min([grid[best], (low + high) / 2], key=getDistance)
+
+    def fit(self, outDegreeDistribution, inDegreeDistribution, oddsRatio=1.0):
+        """ Fits the quadrant probabilities. The degree distributions fix probB+probD and probC+probD, and the odds
+            ratio probA*probD/(probB*probC) fixes how strongly the start and end vertices of an edge are correlated
+
+            @param outDegreeDistribution Target out-degree distribution. @see RMATFitter::fitSecondHalfProb
+            @param inDegreeDistribution Target in-degree distribution. @see RMATFitter::fitSecondHalfProb
+            @param oddsRatio Odds ratio of the quadrants. 1 means that the start and end vertices are independent
+            @return Tuple of probA, probB, probC and probD
+        """
+        startProb = self.fitSecondHalfProb(outDegreeDistribution)
+        endProb = self.fitSecondHalfProb(inDegreeDistribution)
+
+        # probA = 1 - startProb - endProb + probD, probB = startProb - probD and probC = endProb - probD turn the odds
+        # ratio into a quadratic equation in probD
+        product = startProb * endProb
+        if oddsRatio == 1:
+            probD = product
+        else:
+            a = 1 - oddsRatio
+            b = 1 - startProb - endProb + oddsRatio * (startProb + endProb)
+            c = -oddsRatio * product
+            probD = (-b + numpy.sqrt(b * b - 4 * a * c)) / (2 * a)
+            if probD < max(0, startProb + endProb - 1) or probD > min(startProb, endProb):
+                probD = (-b - numpy.sqrt(b * b - 4 * a * c)) / (2 * a)
+
+        return 1 - startProb - endProb + probD, startProb - probD, endProb - probD, probD
@@ -0,0 +1,156 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+import numpy
+
+
+class RMATSampler:
+    """ Vectorized sampler for the RMAT recursion. Draws the quadrant choices of all recursion levels for a whole
+        block of edges at once and turns them into start and end vertex numbers. The sampled distribution is the
+        same as the one of ChooseEdges::selectVertex.
+
+        \ingroup RandomGraphs
+    """
+
+    def __init__(self, startVertX, endVertX, startVertY, endVertY, probA, probB, probC, probD):
+        """ Constructs a sampler for the given adjacency matrix and quadrant probabilities
+
+            @see RandomGraphs::DirectedPowerLawRandomGraph
+        """
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.startVertX = startVertX
+
+        ## @see RandomGraphs::DirectedPowerLawRandomGraph
+        self.startVertY = startVertY
+
+        ## Cumulative distribution of the quadrants A, B and C
+        self.cumulative = numpy.cumsum([probA, probB, probC])
+
+        ## Offsets added to the start column when the right half is chosen at a recursion level
+        self.offsetsX = []
+
+        ## Offsets added to the start row when the lower half is chosen at a recursion level
+        self.offsetsY = []
+
+        # ChooseEdges::selectVertex halves both ranges until they are at most one wide. At every level the
+        # right (lower) half starts at s + (e-s)/2 and the width of either half is (e-s) - (e-s)/2.
+        # A vertex number is therefore the start of the range plus the offsets of the levels at which the
+        # right (lower) half was chosen.
+        widthX = abs(endVertX - startVertX)
+        widthY = abs(endVertY - startVertY)
+        while widthX > 1 or widthY > 1:
+            self.offsetsX.append(widthX/2)
+            self.offsetsY.append(widthY/2)
+            widthX -= widthX/2
+            widthY -= widthY/2
+
+    def sample(self, noOfEdges, randomState):
+        """ Samples a block of edges
+
+            @param noOfEdges Number of edges to sample
+            @param randomState numpy.random.RandomState used for drawing the quadrants
+            @return Tuple of two numpy arrays holding the start and end vertex numbers
+        """
+        startVertices = numpy.empty(noOfEdges, dtype=numpy.int64)
+        startVertices.fill(self.startVertX)
+        endVertices = numpy.empty(noOfEdges, dtype=numpy.int64)
+        endVertices.fill(self.startVertY)
+
+        cumulative = self.cumulative
+        for offsetX, offsetY in zip(self.offsetsX, self.offsetsY):
+            # Quadrant 0..3 as chosen by ChooseEdges::selectVertex. Bit 0 selects the right half of the
+            # columns (quadrants B and D), bit 1 the lower half of the rows (quadrants C and D)
+            quadrants = numpy.searchsorted(cumulative, randomState.random_sample(noOfEdges), side='right')
+            if offsetX:
+                startVertices += (quadrants & 1) * offsetX
+            if offsetY:
+                endVertices += (quadrants >> 1) * offsetY
+
+        return startVertices, endVertices
+
+    def sampleSerial(self, noOfEdges, noSelfLoops, randomState):
+        """ Samples a block of edges in the layout of a serial edge list
+
+            @param noOfEdges Number of edges to sample
+            @param noSelfLoops If true (set to 1) self loops are discarded from the block
+            @param randomState numpy.random.RandomState used for drawing the quadrants
+            @return Numpy array of alternating start and end vertex numbers
+        """
+        startVertices, endVertices = self.sample(noOfEdges, randomState)
+
+        if noSelfLoops:
+            keep = startVertices != endVertices
+            startVertices = startVertices[keep]
+            endVertices = endVertices[keep]
+
+        serialEdges = numpy.empty(2*len(startVertices), dtype=numpy.int64)
+        serialEdges[0::2] = startVertices
+        serialEdges[1::2] = endVertices
+        return serialEdges
+
+    def sampleBlocks(self, noOfEdges, noSelfLoops, randomState, blockSize, permutation=None):
+        """ Samples edges block by block in the layout of a serial edge list. Only one block is held in memory at a time
+
+            @param noOfEdges Number of edges to sample
+            @param noSelfLoops If true (set to 1) self loops are discarded from the blocks
+            @param randomState numpy.random.RandomState used for drawing the quadrants
+            @param blockSize Number of edges sampled at once
+            @param permutation RandomGraphs::VertexPermutation applied to the vertex numbers of every block. If None, the
+                               vertex numbers are not permuted
+            @return Iterator over numpy arrays of alternating start and end vertex numbers
+        """
+        remainingEdges = noOfEdges
+        while remainingEdges > 0:
+            noOfBlockEdges = min(remainingEdges, blockSize)
+            block = self.sampleSerial(noOfBlockEdges, noSelfLoops, randomState)
+            if permutation is not None:
+                block = permutation.permute(block)
+            yield block
+            remainingEdges -= noOfBlockEdges
+
+    def getVertexType(endVertX, endVertY):
+        """ Smallest integer type holding all vertex numbers. Used for the serial edge lists. Signed types are used
+            because their items are converted to int rather than long by tolist()
+
+            @see RandomGraphs::DirectedPowerLawRandomGraph
+            @return numpy.int32 or numpy.int64
+        """
+        if max(endVertX, endVertY) < 2**31:
+            return numpy.int32
+        return numpy.int64
+
+    getVertexType = staticmethod(getVertexType)
+
+    def getRandomState(seed, streamId):
+        """ Creates the random number generator of one worker. Workers with different stream ids get independent
+            streams, so they never share generator state and every worker's edges can be regenerated on their own
+
+            @param seed Seed of the whole generation. If None, the generator is seeded from the operating system
+            @param streamId Id of the stream, usually the index of the worker
+            @return numpy.random.RandomState
+        """
+        if seed is None:
+            return numpy.random.RandomState()
+        return numpy.random.RandomState([seed & 0xffffffff, seed >> 32 & 0xffffffff, streamId])
+
+    getRandomState = staticmethod(getRandomState)
@@ -0,0 +1,96 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+#
+#
+
+import numpy
+
+
+class VertexPermutation:
+    """ Keyed bijective permutation of the vertex numbers 1 to size. Used for scrambling the vertex numbers of the
+        generated graphs, whose low numbers are otherwise the hubs. It is a balanced Feistel network on the smallest
+        even number of bits covering the vertex numbers, with cycle walking for the numbers above size. No table of
+        the permutation is kept, so whole blocks of vertex numbers are permuted with a few vectorized operations
+
+        \ingroup RandomGraphs
+    """
+
+    ## Number of Feistel rounds
+    noOfRounds = 4
+
+    def __init__(self, size, key):
+        """ Constructs a permutation
+
+            @param size Number of vertices to permute
+            @param key Key of the permutation. Different keys give unrelated permutations
+        """
+        ## Number of vertices to permute
+        self.size = size
+
+        halfBits = 1
+        while 4 ** halfBits < size:
+            halfBits += 1
+
+        ## Number of bits of each half of the Feistel network
+        self.halfBits = numpy.uint64(halfBits)
+
+        ## Mask of the bits of one half
+        self.mask = numpy.uint64(2 ** halfBits - 1)
+
+        ## Keys of the rounds
+        self.roundKeys = numpy.random.RandomState([key & 0xffffffff, key >> 32 & 0xffffffff]).randint(
+            0, 2**63, VertexPermutation.noOfRounds).astype(numpy.uint64)
+
+    def scramble(self, values):
+        """ Applies the Feistel network to numbers in [0, 4**halfBits)
+
+            @param values Numpy array of numpy.uint64
+            @return Numpy array of numpy.uint64
+        """
+        halfBits = self.halfBits
+        mask = self.mask
+        left = values >> halfBits
+        right = values & mask
+        for roundKey in self.roundKeys:
+            # Round function: a 64 bit mixer of the right half and the round key
+            mixed = (right ^ roundKey) * numpy.uint64(0x9E3779B97F4A7C15)
+            mixed ^= mixed >> numpy.uint64(29)
+            mixed *= numpy.uint64(0xBF58476D1CE4E5B9)
+            mixed ^= mixed >> numpy.uint64(32)
+            left, right = right, left ^ (mixed & mask)
+        return (left << halfBits) | right
+
+    def permute(self, vertices):
+        """ Permutes vertex numbers
+
+            @param vertices Numpy array of vertex numbers from 1 to size
+            @return Numpy array of the permuted vertex numbers, of the type of vertices
+        """
+        values = self.scramble((vertices - 1).astype(numpy.uint64))
+
+        # Cycle walking: numbers that leave the range are scrambled again until they are back in it
+        size = numpy.uint64(self.size)
+        outside = numpy.nonzero(values >= size)[0]
+        while len(outside):
+            values[outside] = self.scramble(values[outside])
+            outside = outside[values[outside] >= size]
+
+        return (values + numpy.uint64(1)).astype(vertices.dtype)
@@ -0,0 +1,193 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import numpy
+
+from pygel.BaseElements.Vertex import *
+from pygel.BaseElements.Edge import *
+from pygel.Graph.NumberedEdgeUndirectedGraph import *
+from pygel.Exceptions.Exceptions import *
+from RMATSampler import *
+from EdgeWriter import *
+
+
+class WattsStrogatzRandomGraph(NumberedEdgeUndirectedGraph):
+
+    """ Generates a Watts-Strogatz small-world graph. Every vertex of a ring is joined to its noOfNeighbors nearest
+        vertices, and then every edge keeps its first vertex and gets a new uniform second vertex with probability
+        rewiringProb, avoiding self loops and parallel edges. The ring and the rewiring are built with array
+        operations on the serial edge list, so no Python work is done per edge
+        \ingroup RandomGraphs
+    """
+
+    ## Number of rounds in a row without a rewired edge after which WattsStrogatzRandomGraph::generate keeps the
+    ## edges left over in place
+    maxIdleRounds = 10
+
+    def __init__(self, size, noOfNeighbors, rewiringProb, seed=None):
+        """ Constructs an empty graph
+
+            @param size Number of vertices of the ring
+            @param noOfNeighbors Number of nearest vertices every vertex is joined to, half on each side. Must be even
+                                 and less than size
+            @param rewiringProb Probability of rewiring every edge
+            @param seed Seed of the random number generator. With a seed the generated edges are reproducible
+            @throws PackageExceptions::DistError
+        """
+        NumberedEdgeUndirectedGraph.__init__(self)
+
+        if noOfNeighbors % 2 != 0 or noOfNeighbors >= size:
+            raise DistError(ErrorMessages.ringNeighbors)
+        if rewiringProb < 0 or rewiringProb > 1:
+            raise DistError(ErrorMessages.probOutOfRange)
+
+        ## Number of vertices of the ring
+        self.graphSize = size
+
+        ## Number of nearest vertices every vertex is joined to
+        self.noOfNeighbors = noOfNeighbors
+
+        ## Probability of rewiring every edge
+        self.rewiringProb = rewiringProb
+
+        ## Seed of the random number generator
+        self.seed = seed
+
+        ## Temporary storage of edges. Numpy array of alternating start and end vertex numbers
+        self.serialEdgeList = numpy.empty(0, dtype=RMATSampler.getVertexType(size, size))
+
+    def generate(self, noOfThreads=1, noSelfLoops=1):
+        """ Generates the graph. All edges chosen for rewiring draw their new vertex at once. Those that hit their own
+            vertex, an edge already present or another new edge draw again in the next round
+
+            @param noOfThreads Ignored, the rewiring rounds run in the calling thread
+            @param noSelfLoops Ignored. Rewiring never creates self loops
+        """
+        size = self.graphSize
+        halfNeighbors = self.noOfNeighbors / 2
+        randomState = RMATSampler.getRandomState(self.seed, 0)
+
+        # Ring edge i joins vertex i / halfNeighbors to the vertex i % halfNeighbors + 1 steps further
+        startVertices = numpy.repeat(numpy.arange(size, dtype=numpy.int64), halfNeighbors)
+        endVertices = (startVertices + numpy.tile(numpy.arange(1, halfNeighbors + 1), size)) % size
+
+        ringEndVertices = endVertices.copy()
+        rewired = numpy.nonzero(randomState.random_sample(len(startVertices)) < self.rewiringProb)[0]
+        onRing = numpy.ones(len(startVertices), dtype=bool)
+        onRing[rewired] = False
+
+        # Edges are identified by min*size + max. Only the keys of the rewired edges are stored, sorted, as the
+        # edges left on the ring are found from the vertex distance
+        rewiredKeys = numpy.empty(0, dtype=numpy.int64)
+
+        idleRounds = 0
+        while len(rewired) and idleRounds < WattsStrogatzRandomGraph.maxIdleRounds:
+            rewiredStarts = startVertices[rewired]
+            newEndVertices = randomState.randint(0, size, len(rewired)).astype(numpy.int64)
+
+            keys = WattsStrogatzRandomGraph.getKeys(rewiredStarts, newEndVertices, size)
+            order = numpy.argsort(keys, kind='mergesort')
+            sortedKeys = keys[order]
+
+            accepted = (newEndVertices != rewiredStarts) & ~WattsStrogatzRandomGraph.isOnRing(
+                rewiredStarts, newEndVertices, onRing, size, halfNeighbors)
+            accepted[order[1:][sortedKeys[1:] == sortedKeys[:-1]]] = False
+            if len(rewiredKeys):
+                accepted[order] &= rewiredKeys.take(numpy.searchsorted(rewiredKeys, sortedKeys), mode='clip') != sortedKeys
+
+            endVertices[rewired[accepted]] = newEndVertices[accepted]
+            acceptedKeys = sortedKeys[accepted[order]]
+            rewiredKeys = numpy.insert(rewiredKeys, numpy.searchsorted(rewiredKeys, acceptedKeys), acceptedKeys)
+            rewired = rewired[~accepted]
+            if accepted.any():
+                idleRounds = 0
+            else:
+                idleRounds += 1
+
+        # Edges that could not be rewired, because their vertex is joined to all others, stay on the ring. A rewired
+        # edge that took the place of one of them goes back to the ring as well, until no place is taken twice, so
+        # the graph keeps all its edges
+        if len(rewired):
+            onRing[rewired] = True
+            while True:
+                moved = numpy.nonzero(~onRing)[0]
+                ringKeys = WattsStrogatzRandomGraph.getKeys(startVertices[onRing], endVertices[onRing], size)
+                movedKeys = WattsStrogatzRandomGraph.getKeys(startVertices[moved], endVertices[moved], size)
+                taken = moved[numpy.in1d(movedKeys, ringKeys)]
+                if not len(taken):
+                    break
+                onRing[taken] = True
+                endVertices[taken] = ringEndVertices[taken]
+
+        serialEdgeList = numpy.empty(2*len(startVertices), dtype=numpy.int64)
+        serialEdgeList[0::2] = startVertices + 1
+        serialEdgeList[1::2] = endVertices + 1
+        self.serialEdgeList = serialEdgeList.astype(RMATSampler.getVertexType(size, size))
+
+    def isOnRing(startVertices, endVertices, onRing, size, halfNeighbors):
+        """ Finds the edges that are ring edges which have not been rewired
+
+            @param startVertices Numpy array of start vertices, counted from 0
+            @param endVertices Numpy array of end vertices, counted from 0
+            @param onRing Numpy array of booleans telling whether every ring edge is still in place
+            @param size Number of vertices
+            @param halfNeighbors Number of nearest vertices on each side of a vertex
+            @return Numpy array of booleans
+        """
+        distances = (endVertices - startVertices) % size
+        forward = (distances >= 1) & (distances <= halfNeighbors)
+        backward = (size - distances <= halfNeighbors) & (distances > 0)
+
+        ringEdges = numpy.zeros(len(startVertices), dtype=numpy.int64)
+        ringEdges[forward] = startVertices[forward] * halfNeighbors + distances[forward] - 1
+        ringEdges[backward] = endVertices[backward] * halfNeighbors + size - distances[backward] - 1
+        return (forward | backward) & onRing[ringEdges]
+
+    isOnRing = staticmethod(isOnRing)
+
+    def getKeys(startVertices, endVertices, size):
+        """ Numbers the undirected edges
+
+            @param startVertices Numpy array of start vertices, counted from 0
+            @param endVertices Numpy array of end vertices, counted from 0
+            @param size Number of vertices
+            @return Numpy array with min*size + max for every edge
+        """
+        return numpy.minimum(startVertices, endVertices) * size + numpy.maximum(startVertices, endVertices)
+
+    getKeys = staticmethod(getKeys)
+
+    def populate(self):
+        """ Populate graph with edges generated after a call to WattsStrogatzRandomGraph::generate
+        """
+        serialEdgeList = self.serialEdgeList
+        self.addEdges(serialEdgeList[0::2], serialEdgeList[1::2])
+
+    def writeEdges(self, fileName, format):
+        """ Write edges to file
+
+            @param fileName File name to store edges
+            @param format Format of output file. @see RandomGraphs::EdgeWriter
+        """
+        EdgeWriter.writeSerialEdges(self.serialEdgeList, fileName, format, 0)
@@ -28,5 +28,5 @@
 
 """
 
-__all__ = ['DirectedPowerLawRandomGraph','ChooseEdges', 'UndirectedPowerLawRandomGraph']
+__all__ = ['DirectedPowerLawRandomGraph','ChooseEdges', 'UndirectedPowerLawRandomGraph', 'RMATSampler', 'ChooseEdgesProcess', 'EdgeWriter', 'EdgeStream', 'EdgeMerger', 'KroneckerSampler', 'KroneckerRandomGraph', 'VertexPermutation', 'ErdosRenyiSampler', 'DirectedErdosRenyiRandomGraph', 'UndirectedErdosRenyiRandomGraph', 'PreferentialAttachmentRandomGraph', 'BernoulliBlockSampler', 'ChungLuRandomGraph', 'CommunityRandomGraph', 'WattsStrogatzRandomGraph', 'ConfigurationModelRandomGraph', 'GeometricRandomGraph', 'RMATFitter', 'GenerationProgress', 'GenerationEngine', 'InfiniteEdgeStream', 'GenerationRun']
 
@@ -35,5 +35,6 @@ setup(name         = 'pygel',
                       'pygel.MetaClass',
                       'pygel.RandomGraphs',
                       'pygel.Graph'],
+      requires     = ['numpy'],
       **kwds
       )
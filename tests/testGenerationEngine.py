@@ -0,0 +1,55 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import unittest
+from pygel.RandomGraphs.GenerationEngine import *
+from pygel.RandomGraphs.RMATSampler import *
+
+
+class GenerationEngineTest(unittest.TestCase):
+    """ Tests of RandomGraphs::GenerationEngine
+    """
+
+    def generate(self, workerType, noOfEdges, chunkSize):
+        """ Generates an RMAT graph with 1024 vertices
+
+            @return Numpy array of alternating start and end vertex numbers
+        """
+        sampler = RMATSampler(0, 1023, 0, 1023, 0.45, 0.15, 0.15, 0.25)
+        return GenerationEngine(1, workerType, chunkSize).generate(noOfEdges, 0, sampler, 1023, 1)
+
+    def testManySmallChunksWithProcesses(self):
+        """ A process cannot exit before its finished chunks are read from the queue, so waiting for it must read
+            them
+        """
+        self.assertEqual(len(self.generate('process', 200000, 10)), 2*200000)
+
+    def testSameEdgesForThreadsAndProcesses(self):
+        """ A seeded generation gives the same edges with both kinds of workers
+        """
+        self.assertTrue((self.generate('thread', 5000, 10) == self.generate('process', 5000, 10)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import unittest
+import numpy
+from pygel.RandomGraphs.KroneckerRandomGraph import *
+
+
+class KroneckerRandomGraphTest(unittest.TestCase):
+    """ Tests of RandomGraphs::KroneckerRandomGraph
+    """
+
+    def testSameMarginalsAsRMAT(self):
+        """ With the same quadrant probabilities the Kronecker and RMAT samplers give the same mean start and end
+            vertices. The probabilities are skewed so that swapped quadrants B and C show
+        """
+        probs = (0.5, 0.3, 0.05, 0.15)
+        graph = KroneckerRandomGraph([[0.25, 0.25], [0.25, 0.25]], 10, 0)
+        graph.setProbs(*probs)
+
+        kroneckerStarts, kroneckerEnds = graph.sampler.sample(200000, numpy.random.RandomState(1))
+        rmatStarts, rmatEnds = RMATSampler(1, 1025, 1, 1025, *probs).sample(200000, numpy.random.RandomState(2))
+
+        self.assertTrue(abs(kroneckerStarts.mean() - rmatStarts.mean()) < 10)
+        self.assertTrue(abs(kroneckerEnds.mean() - rmatEnds.mean()) < 10)
+        self.assertTrue(abs(kroneckerStarts.mean() - kroneckerEnds.mean()) > 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2007 Saket Sathe
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+#
+# $LastChangedBy: xaeroman $
+# $LastChangedDate: 2008-12-13 02:02:58 +0100 (Sat, 13 Dec 2008) $
+# $LastChangedRevision: 96 $
+# 
+#
+
+
+import unittest
+from pygel.RandomGraphs.WattsStrogatzRandomGraph import *
+
+
+class WattsStrogatzRandomGraphTest(unittest.TestCase):
+    """ Tests of RandomGraphs::WattsStrogatzRandomGraph
+    """
+
+    def testEdgeCount(self):
+        """ Rewiring keeps size*noOfNeighbors/2 distinct edges without self loops, also when the ring is complete and
+            some edges find no free vertex
+        """
+        for size, noOfNeighbors, rewiringProb in [(7, 6, 1.0), (9, 8, 0.7), (20, 18, 1.0), (100, 10, 0.3)]:
+            for seed in range(10):
+                graph = WattsStrogatzRandomGraph(size, noOfNeighbors, rewiringProb, seed)
+                graph.generate()
+                edges = graph.serialEdgeList.reshape(-1, 2).tolist()
+
+                self.assertEqual(len(edges), size*noOfNeighbors/2)
+                self.assertEqual(len(set([(min(edge), max(edge)) for edge in edges])), len(edges))
+                self.assertTrue(min([edge[1] - edge[0] != 0 for edge in edges]))
+
+
+if __name__ == '__main__':
+    unittest.main()